@@ -0,0 +1,142 @@
+"""
+Agent worker pool.
+
+Runs AgentCoordinator queue consumers in separate processes, so LangGraph
+execution, prompt building and state validation scale with cores instead of
+sharing the event loop with FastAPI and the Discord gateway. Start the API
+with RUN_AGENTS_IN_PROCESS=false so it only handles ingress and egress:
+
+    python agent_worker.py --processes 4
+
+Workers consume the agent task queues of the shared RabbitMQ broker; Discord
+responses go back on the egress queues consumed by the API process. The task
+queues are sharded by conversation (QUEUE_SHARDS) and worker N owns the
+shards congruent to N modulo the process count, so each conversation is
+served by exactly one process. Crashed worker processes are restarted with
+the same shards.
+
+Each worker keeps its own queue and node timing metrics; worker N serves them
+at http://<host>:<AGENT_WORKER_METRICS_PORT + N>/metrics for Prometheus to
+scrape alongside the API's /v1/metrics.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import List
+
+from app.core.config import settings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Pause before restarting a crashed worker so a persistent failure can't spin
+RESTART_DELAY_SECONDS = 5
+
+
+def worker_shards(index: int, processes: int) -> List[int]:
+    """Task queue shards owned by worker ``index`` of ``processes``"""
+    return [shard for shard in range(settings.queue_shards) if shard % processes == index]
+
+
+async def run_worker(index: int, processes: int):
+    """Consume agent requests from this worker's shards until SIGINT/SIGTERM"""
+    from app.core.metrics import start_metrics_server
+    from app.core.orchestration.agent_coordinator import AgentCoordinator
+    from app.core.orchestration.queue_manager import AsyncQueueManager
+
+    shards = worker_shards(index, processes)
+    queue_manager = AsyncQueueManager(shards=shards)
+    coordinator = AgentCoordinator(queue_manager)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await queue_manager.start()
+    await coordinator.start()
+    metrics_server = None
+    if settings.agent_worker_metrics_port:
+        metrics_port = settings.agent_worker_metrics_port + index
+        metrics_server = await start_metrics_server(metrics_port, collect=queue_manager.collect_metrics)
+        logger.info(f"Serving worker metrics on port {metrics_port}")
+    logger.info(f"Agent worker ready, consuming task shards {shards}")
+    try:
+        await stop_event.wait()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        await queue_manager.stop()
+        await coordinator.stop()
+        logger.info("Agent worker stopped")
+
+
+def _worker_main(index: int, processes: int):
+    asyncio.run(run_worker(index, processes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Devr.AI agent workers in separate processes")
+    parser.add_argument("--processes", type=int, default=settings.agent_worker_processes,
+                        help="number of worker processes (default: AGENT_WORKER_PROCESSES)")
+    args = parser.parse_args()
+
+    if settings.queue_backend.lower() != "rabbitmq":
+        logger.error("Agent worker processes need a shared broker; set QUEUE_BACKEND=rabbitmq")
+        sys.exit(1)
+
+    process_count = max(1, args.processes)
+    if process_count > settings.queue_shards:
+        logger.error(f"{process_count} worker processes need at least as many task queue shards; "
+                     f"set QUEUE_SHARDS >= {process_count}")
+        sys.exit(1)
+
+    context = multiprocessing.get_context("spawn")
+    processes = {}
+    stopping = False
+
+    def spawn(index: int):
+        process = context.Process(target=_worker_main, args=(index, process_count), name=f"agent-worker-{index}")
+        process.start()
+        processes[index] = process
+        logger.info(f"Started {process.name} (pid {process.pid})")
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for index in range(process_count):
+        spawn(index)
+
+    while processes:
+        wait([process.sentinel for process in processes.values()])
+        for index, process in list(processes.items()):
+            if process.is_alive():
+                continue
+            del processes[index]
+            if stopping:
+                continue
+            logger.error(f"{process.name} exited with code {process.exitcode}, restarting")
+            time.sleep(RESTART_DELAY_SECONDS)
+            spawn(index)
+
+    logger.info("All agent workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, List, Optional, Union
 from abc import ABC, abstractmethod
 import logging
+from app.core.llm import is_transient_llm_error
 from .state import AgentState
 
 logger = logging.getLogger(__name__)
@@ -20,11 +21,15 @@ class BaseAgent(ABC):
         pass
 
     async def run(self, initial_state: AgentState, thread_id: str) -> AgentState:
-        """Execute the agent workflow with memory persistence"""
+        """Execute the agent workflow with memory persistence.
+
+        Transient LLM errors are raised so the caller can retry the run;
+        other failures are returned in the state's ``errors``.
+        """
         try:
             logger.info(f"Starting {self.agent_name} for session {initial_state.session_id}")
             config = {"configurable": {"thread_id": thread_id}}
-            existing_state = self.graph.get_state(config)
+            existing_state = await self.graph.aget_state(config)
 
             if existing_state and existing_state.values:
                 existing_agent_state = AgentState(**existing_state.values)
@@ -48,31 +53,41 @@ class BaseAgent(ABC):
             state_dict['errors'].append(f"Agent initialization error: {str(e)}")
             return AgentState(**state_dict)
         except Exception as e:
+            if is_transient_llm_error(e):
+                raise
             logger.error("Error in %s: %s", self.agent_name, str(e))
             state_dict = initial_state.model_dump()
             state_dict['errors'].append(str(e))
             return AgentState(**state_dict)
 
-    async def stream_run(self, initial_state: AgentState, thread_id: str) -> AsyncGenerator[Dict[str, Any], None]:
-        """Stream the agent execution for real-time updates"""
+    async def stream_run(self, initial_state: AgentState, thread_id: str,
+                         stream_mode: Optional[Union[str, List[str]]] = None) -> AsyncGenerator[Any, None]:
+        """Stream the agent execution for real-time updates.
+
+        ``stream_mode`` is passed to LangGraph (node updates by default). With
+        several modes each step is a ``(mode, chunk)`` tuple. On failure a
+        single ``{"error": ...}`` dict is yielded, except for transient LLM
+        errors, which are raised.
+        """
         try:
             if not self.graph:
                 raise AttributeError("Graph not properly initialized")
             config = {"configurable": {"thread_id": thread_id}}
             logger.info(f"Streaming with memory for thread {thread_id}")
-            existing_state = self.graph.get_state(config)
+            existing_state = await self.graph.aget_state(config)
             if existing_state and existing_state.values:
                 existing_agent_state = AgentState(**existing_state.values)
                 logger.info(f"Streaming with existing state: {len(existing_agent_state.messages)} messages, "
                             f"interaction count: {existing_agent_state.interaction_count}")
 
             step_count = 0
-            async for step in self.graph.astream(initial_state.model_dump(), config):
+            async for step in self.graph.astream(initial_state.model_dump(), config, stream_mode=stream_mode):
                 step_count += 1
-                logger.debug(f"Stream step {step_count}: {list(step.keys())}")
                 yield step
 
             logger.info(f"Streaming completed after {step_count} steps")
         except Exception as e:
+            if is_transient_llm_error(e):
+                raise
             logger.error("Error in %s stream: %s", self.agent_name, str(e))
             yield {"error": str(e)}
@@ -0,0 +1,313 @@
+"""
+Durable LangGraph checkpointer with a hot cache of recently active threads.
+
+Checkpoints are written through to SQLite (WAL mode, the default) or
+Postgres, so conversation memory survives restarts and is shared by every
+agent worker process. The latest checkpoint of up to
+``agent_checkpoint_cache_size`` threads is also kept in an LRU, serialized,
+so resuming an active conversation skips the database read. Older
+checkpoints beyond ``agent_checkpoint_history`` are pruned as threads are
+written, which keeps storage proportional to the number of threads rather
+than turns. Only the savers' public API is used, so every backend is pruned
+and listed the same way.
+"""
+import asyncio
+import logging
+import os
+import random
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (thread_id, checkpoint_ns)
+CacheKey = Tuple[str, str]
+
+
+class _CachedCheckpoint:
+    """Latest checkpoint of a thread, kept serialized to stay compact"""
+
+    __slots__ = ("checkpoint_id", "checkpoint", "metadata", "parent_checkpoint_id")
+
+    def __init__(self, checkpoint_id: str, checkpoint: Tuple[str, bytes],
+                 metadata: CheckpointMetadata, parent_checkpoint_id: Optional[str]):
+        self.checkpoint_id = checkpoint_id
+        self.checkpoint = checkpoint
+        self.metadata = metadata
+        self.parent_checkpoint_id = parent_checkpoint_id
+
+
+class BoundedCheckpointSaver(BaseCheckpointSaver[str]):
+    """Write-through checkpoint saver over a durable backend.
+
+    The durable saver is created on first use, inside the running event loop.
+    When agents run in several processes, another process may have moved a
+    thread on since it was cached, so the cache is bypassed and every read
+    goes to the shared database.
+    """
+
+    def __init__(self, backend: str, cache_size: int, history: int):
+        super().__init__()
+        self.backend = backend
+        self.cache_size = cache_size
+        self.history = max(1, history)
+        # Other agent processes may write the same threads to the shared database
+        self.shared = backend != "memory" and not settings.run_agents_in_process
+        self._durable: Optional[BaseCheckpointSaver] = None
+        self._resources: List[Any] = []
+        self._init_lock = asyncio.Lock()
+        self._cache: "OrderedDict[CacheKey, _CachedCheckpoint]" = OrderedDict()
+        # Checkpoints written per thread since its history was last pruned
+        self._unpruned: Dict[str, int] = {}
+        # Keeps pending writes from landing while a thread is being rebuilt
+        self._write_lock = asyncio.Lock()
+
+    async def _saver(self) -> BaseCheckpointSaver:
+        if self._durable is None:
+            async with self._init_lock:
+                if self._durable is None:
+                    self._durable = await self._create_durable()
+                    logger.info(f"Initialized {self.backend} checkpointer")
+        return self._durable
+
+    async def _create_durable(self) -> BaseCheckpointSaver:
+        if self.backend == "memory":
+            return InMemorySaver()
+
+        if self.backend == "postgres":
+            try:
+                from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+                from psycopg.rows import dict_row
+                from psycopg_pool import AsyncConnectionPool
+            except ImportError as e:
+                raise RuntimeError(
+                    "The postgres checkpointer needs langgraph-checkpoint-postgres and psycopg[pool]"
+                ) from e
+            pool = AsyncConnectionPool(
+                settings.agent_checkpoint_postgres_url,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                open=False
+            )
+            await pool.open()
+            self._resources.append(pool)
+            saver = AsyncPostgresSaver(pool)
+            await saver.setup()
+            return saver
+
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        path = settings.agent_checkpoint_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = await aiosqlite.connect(path)
+        self._resources.append(conn)
+        saver = AsyncSqliteSaver(conn)
+        # setup() switches the database to WAL; NORMAL sync is durable enough under WAL
+        await saver.setup()
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        return saver
+
+    async def aclose(self):
+        """Close the durable backend's connections"""
+        for resource in reversed(self._resources):
+            try:
+                await resource.close()
+            except Exception as e:
+                logger.warning(f"Error closing checkpointer resource: {e}")
+        self._resources.clear()
+        self._durable = None
+        self._cache.clear()
+        self._unpruned.clear()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        saver = await self._saver()
+        if get_checkpoint_id(config) is None:
+            cached = await self._cached_latest(config)
+            if cached is not None:
+                return cached
+        checkpoint_tuple = await saver.aget_tuple(config)
+        if checkpoint_tuple is not None and not checkpoint_tuple.pending_writes and get_checkpoint_id(config) is None:
+            self._remember(
+                self._key(checkpoint_tuple.config),
+                checkpoint_tuple.checkpoint,
+                checkpoint_tuple.metadata,
+                get_checkpoint_id(checkpoint_tuple.parent_config) if checkpoint_tuple.parent_config else None
+            )
+        return checkpoint_tuple
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        saver = await self._saver()
+        async for checkpoint_tuple in saver.alist(config, filter=filter, before=before, limit=limit):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saver = await self._saver()
+        next_config = await saver.aput(config, checkpoint, metadata, new_versions)
+        key = self._key(next_config)
+        # A fresh checkpoint has no pending writes yet, so it is cacheable as-is
+        self._remember(key, checkpoint, get_checkpoint_metadata(config, metadata), get_checkpoint_id(config))
+        thread_id = key[0]
+        self._unpruned[thread_id] = self._unpruned.get(thread_id, 0) + 1
+        if self._unpruned[thread_id] >= self.history:
+            await self._prune(thread_id)
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        saver = await self._saver()
+        # Pending writes change the latest tuple; reload it from the backend next time
+        self._cache.pop(self._key(config), None)
+        async with self._write_lock:
+            await saver.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        saver = await self._saver()
+        for key in [key for key in self._cache if key[0] == thread_id]:
+            del self._cache[key]
+        self._unpruned.pop(thread_id, None)
+        await saver.adelete_thread(thread_id)
+
+    async def alist_thread_ids(self) -> List[str]:
+        """Ids of every thread with a stored checkpoint"""
+        saver = await self._saver()
+        thread_ids: Dict[str, None] = {}
+        async for checkpoint_tuple in saver.alist(None):
+            thread_ids[checkpoint_tuple.config["configurable"]["thread_id"]] = None
+        return list(thread_ids)
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        # Same version format as the bundled memory, SQLite and Postgres savers
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    @staticmethod
+    def _key(config: RunnableConfig) -> CacheKey:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    def _remember(self, key: CacheKey, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                  parent_checkpoint_id: Optional[str]):
+        if self.cache_size <= 0 or self.shared:
+            return
+        self._cache[key] = _CachedCheckpoint(
+            checkpoint["id"], self.serde.dumps_typed(checkpoint), dict(metadata), parent_checkpoint_id
+        )
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _cached_latest(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = self._key(config)
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        self._cache.move_to_end(key)
+        thread_id, checkpoint_ns = key
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                     "checkpoint_id": cached.checkpoint_id}},
+            checkpoint=self.serde.loads_typed(cached.checkpoint),
+            metadata=dict(cached.metadata),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                  "checkpoint_id": cached.parent_checkpoint_id}}
+                if cached.parent_checkpoint_id else None
+            ),
+            pending_writes=[]
+        )
+
+    async def _prune(self, thread_id: str):
+        """Rebuild a thread from the newest ``history`` checkpoints of each namespace.
+
+        The savers cannot delete single checkpoints, so the kept ones are read
+        with their pending writes, the thread is deleted and they are written
+        back oldest first. Runs once every ``history`` writes to the thread,
+        so a thread holds at most twice its history between rebuilds.
+        """
+        saver = self._durable
+        async with self._write_lock:
+            self._unpruned.pop(thread_id, None)
+            kept: List[CheckpointTuple] = []
+            per_namespace: Dict[str, int] = {}
+            total = 0
+            # Newest first within each namespace
+            async for checkpoint_tuple in saver.alist({"configurable": {"thread_id": thread_id}}):
+                total += 1
+                checkpoint_ns = checkpoint_tuple.config["configurable"].get("checkpoint_ns", "")
+                if per_namespace.get(checkpoint_ns, 0) < self.history:
+                    per_namespace[checkpoint_ns] = per_namespace.get(checkpoint_ns, 0) + 1
+                    kept.append(checkpoint_tuple)
+            if total == len(kept):
+                return
+
+            await saver.adelete_thread(thread_id)
+            for checkpoint_tuple in reversed(kept):
+                await self._restore(saver, checkpoint_tuple)
+            logger.debug(f"Pruned thread {thread_id} from {total} to {len(kept)} checkpoints")
+
+    @staticmethod
+    async def _restore(saver: BaseCheckpointSaver, checkpoint_tuple: CheckpointTuple):
+        """Write a checkpoint read back from ``saver`` again, with its pending writes"""
+        configurable = checkpoint_tuple.config["configurable"]
+        parent_config = checkpoint_tuple.parent_config or {
+            "configurable": {"thread_id": configurable["thread_id"],
+                             "checkpoint_ns": configurable.get("checkpoint_ns", "")}
+        }
+        checkpoint = checkpoint_tuple.checkpoint
+        # Every channel is written again, not just those changed by this checkpoint
+        config = await saver.aput(
+            parent_config, checkpoint, checkpoint_tuple.metadata, dict(checkpoint["channel_versions"])
+        )
+        writes_by_task: Dict[str, List[Tuple[str, Any]]] = {}
+        for task_id, channel, value in checkpoint_tuple.pending_writes or []:
+            writes_by_task.setdefault(task_id, []).append((channel, value))
+        for task_id, writes in writes_by_task.items():
+            await saver.aput_writes(config, writes, task_id)
+
+
+def create_checkpointer() -> BoundedCheckpointSaver:
+    """Checkpointer for ``settings.agent_checkpointer``: "sqlite", "postgres" or "memory" """
+    backend = settings.agent_checkpointer.lower()
+    if backend not in ("sqlite", "postgres", "memory"):
+        logger.warning(f"Unknown checkpointer '{settings.agent_checkpointer}', using sqlite")
+        backend = "sqlite"
+    return BoundedCheckpointSaver(backend, settings.agent_checkpoint_cache_size, settings.agent_checkpoint_history)
@@ -1,58 +1,63 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from functools import partial
 from langgraph.graph import StateGraph, END
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import InMemorySaver
 from ..base_agent import BaseAgent, AgentState
+from ..checkpointer import create_checkpointer
 from .tools.search_tool.ddg import DuckDuckGoSearchTool
 from .tools.faq_tool import FAQTool
 from .github.github_toolkit import GitHubToolkit
 from app.core.config import settings
+from app.core.llm import get_llm
+from app.core.timing import timed_node
 from .nodes.gather_context import gather_context_node
 from .nodes.summarization import check_summarization_needed, summarize_conversation_node, store_summary_to_database
-from .nodes.react_supervisor import react_supervisor_node, supervisor_decision_router
+from .nodes.react_supervisor import join_tool_results, react_supervisor_node, supervisor_decision_router
+from .nodes.supervisor_rules import SupervisorRules, default_rules
 from .tool_wrappers import web_search_tool_node, faq_handler_tool_node, onboarding_tool_node, github_toolkit_tool_node
 from .nodes.generate_response import generate_response_node
 
 logger = logging.getLogger(__name__)
 
+# Summary passes per summarize_thread call; each covers one prompt budget of messages
+MAX_SUMMARY_PASSES = 3
+
 class DevRelAgent(BaseAgent):
     """DevRel LangGraph Agent for community support and engagement"""
 
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.devrel_agent_model,
-            temperature=0.3,
-            google_api_key=settings.gemini_api_key
-        )
+        self.llm = get_llm(settings.devrel_agent_model, temperature=0.3)
         self.search_tool = DuckDuckGoSearchTool()
         self.faq_tool = FAQTool()
         self.github_toolkit = GitHubToolkit()
-        self.checkpointer = InMemorySaver()
+        self.supervisor_rules = SupervisorRules(default_rules(self.faq_tool))
+        self.checkpointer = create_checkpointer()
         super().__init__("DevRelAgent", self.config)
 
     def _build_graph(self):
         """Build the DevRel agent workflow graph"""
         workflow = StateGraph(AgentState)
 
+        def add_node(name: str, node):
+            # Every node is timed (wall, LLM and DB time, tokens)
+            workflow.add_node(name, timed_node(name, node))
+
         # Phase 1: Gather Context
-        workflow.add_node("gather_context", gather_context_node)
+        add_node("gather_context", gather_context_node)
 
         # Phase 2: ReAct Supervisor - Decide what to do next
-        workflow.add_node("react_supervisor", partial(react_supervisor_node, llm=self.llm))
-        workflow.add_node("web_search_tool", partial(web_search_tool_node, search_tool=self.search_tool, llm=self.llm))
-        workflow.add_node("faq_handler_tool", partial(faq_handler_tool_node, faq_tool=self.faq_tool))
-        workflow.add_node("onboarding_tool", onboarding_tool_node)
-        workflow.add_node("github_toolkit_tool", partial(github_toolkit_tool_node, github_toolkit=self.github_toolkit))
+        add_node("react_supervisor", partial(react_supervisor_node, llm=self.llm, rules=self.supervisor_rules))
+        add_node("web_search_tool", partial(web_search_tool_node, search_tool=self.search_tool, llm=self.llm))
+        add_node("faq_handler_tool", partial(faq_handler_tool_node, faq_tool=self.faq_tool))
+        add_node("onboarding_tool", onboarding_tool_node)
+        add_node("github_toolkit_tool", partial(github_toolkit_tool_node, github_toolkit=self.github_toolkit))
 
         # Phase 3: Generate Response
-        workflow.add_node("generate_response", partial(generate_response_node, llm=self.llm))
+        add_node("generate_response", partial(generate_response_node, llm=self.llm))
 
-        # Phase 4: Summarization
-        workflow.add_node("check_summarization", check_summarization_needed)
-        workflow.add_node("summarize_conversation", partial(summarize_conversation_node, llm=self.llm))
+        # Phase 4: Flag summarization, which runs after the response is sent (see summarize_thread)
+        add_node("check_summarization", check_summarization_needed)
 
         # Entry point
         workflow.set_entry_point("gather_context")
@@ -71,39 +76,47 @@ class DevRelAgent(BaseAgent):
             }
         )
 
-        # All tools return to supervisor
+        # Tools chosen together run in parallel; their results are joined
+        # before returning to the supervisor
+        add_node("join_tool_results", join_tool_results)
         for tool in ["web_search_tool", "faq_handler_tool", "onboarding_tool", "github_toolkit_tool"]:
-            workflow.add_edge(tool, "react_supervisor")
+            workflow.add_edge(tool, "join_tool_results")
+        workflow.add_edge("join_tool_results", "react_supervisor")
 
         workflow.add_edge("generate_response", "check_summarization")
-
-        # Summarization routing
-        workflow.add_conditional_edges(
-            "check_summarization",
-            self._should_summarize,
-            {
-                "summarize": "summarize_conversation",
-                "end": END
-            }
-        )
-
-        workflow.add_edge("summarize_conversation", END)
+        workflow.add_edge("check_summarization", END)
 
         # Compile with checkpointer
         self.graph = workflow.compile(checkpointer=self.checkpointer)
 
-    def _should_summarize(self, state: AgentState) -> str:
-        """Determine if conversation should be summarized"""
-        if state.summarization_needed:
+    async def summarize_thread(self, thread_id: str) -> Optional[AgentState]:
+        """Summarize a thread flagged by check_summarization and write the result to its checkpoint.
+
+        A backlog larger than one summary prompt takes several passes, up to
+        ``MAX_SUMMARY_PASSES``. Returns the thread's state afterwards, or None
+        if it has no state.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = await self.graph.aget_state(config)
+        if not snapshot or not snapshot.values:
+            return None
+
+        state = AgentState(**snapshot.values)
+        for _ in range(MAX_SUMMARY_PASSES):
+            if not state.summarization_needed:
+                break
             logger.info(f"Summarization needed for session {state.session_id}")
-            return "summarize"
-        return "end"
+            updates = await summarize_conversation_node(state, self.llm)
+            await self.graph.aupdate_state(config, updates, as_node="check_summarization")
+            snapshot = await self.graph.aget_state(config)
+            state = AgentState(**snapshot.values)
+        return state
 
     async def get_thread_state(self, thread_id: str) -> Dict[str, Any]:
         """Get the current state of a thread"""
         try:
             config = {"configurable": {"thread_id": thread_id}}
-            state = self.graph.get_state(config)
+            state = await self.graph.aget_state(config)
             return state.values if state else {}
         except Exception as e:
             logger.error(f"Error getting thread state: {str(e)}")
@@ -113,7 +126,7 @@ class DevRelAgent(BaseAgent):
         """Clear memory for a specific thread using memory_timeout_reached flag"""
         try:
             config = {"configurable": {"thread_id": thread_id}}
-            state = self.graph.get_state(config)
+            state = await self.graph.aget_state(config)
 
             if state and state.values:
                 agent_state = AgentState(**state.values)
@@ -128,8 +141,8 @@ class DevRelAgent(BaseAgent):
                     # Store final summary to database before clearing
                     await store_summary_to_database(agent_state)
 
-                    # Delete the thread from InMemorySaver
-                    self.checkpointer.delete_thread(thread_id)
+                    # Delete the thread's checkpoints
+                    await self.checkpointer.adelete_thread(thread_id)
                     logger.info(f"Successfully cleared memory for thread {thread_id}")
                     return True
                 else:
@@ -3,9 +3,8 @@ import json
 import re
 import config
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
 from app.core.config import settings
+from app.core.llm import cached_invoke, get_llm
 from .prompts.intent_analysis import GITHUB_INTENT_ANALYSIS_PROMPT
 from .tools.search import handle_web_search
 from .tools.github_support import handle_github_supp
@@ -34,11 +33,7 @@ class GitHubToolkit:
     """
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.github_agent_model,
-            temperature=0.1,
-            google_api_key=settings.gemini_api_key
-        )
+        self.llm = get_llm(settings.github_agent_model, temperature=0.1)
         self.tools = [
             "web_search",
             "contributor_recommendation",
@@ -56,9 +51,9 @@ class GitHubToolkit:
 
         try:
             prompt = GITHUB_INTENT_ANALYSIS_PROMPT.format(user_query=user_query)
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-
-            content = response.content.strip()
+            content = (await cached_invoke(
+                self.llm, prompt, "github_intent", cacheable=lambda text: "{" in text
+            )).strip()
 
             try:
                 result = json.loads(content)
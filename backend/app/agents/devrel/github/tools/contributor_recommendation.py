@@ -2,10 +2,9 @@ import logging
 import re
 from typing import Any, Dict
 from urllib.parse import urlparse
-from langchain_core.messages import HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from app.core.config import settings
+from app.core.llm import cached_invoke, get_llm
 from app.database.weaviate.operations import search_contributors
 from app.services.github.issue_processor import GitHubIssueProcessor
 from app.services.embedding_service.service import EmbeddingService
@@ -19,11 +18,7 @@ class ContributorRecommendationWorkflow:
     """
 
     def __init__(self):
-        self.query_alignment_llm = ChatGoogleGenerativeAI(
-            model=settings.github_agent_model,
-            temperature=0.1,
-            google_api_key=settings.gemini_api_key
-        )
+        self.query_alignment_llm = get_llm(settings.github_agent_model, temperature=0.1)
         self.embedding_service = EmbeddingService()
 
     async def _align_user_request(self, query: str) -> Dict[str, Any]:
@@ -42,12 +37,13 @@ class ContributorRecommendationWorkflow:
             full_query = query
 
         prompt = QUERY_ALIGNMENT_PROMPT.format(query=full_query)
-        response = await self.query_alignment_llm.ainvoke([HumanMessage(content=prompt)])
+        content = await cached_invoke(
+            self.query_alignment_llm, prompt, "query_alignment", cacheable=lambda text: "{" in text
+        )
 
         try:
             import json
-            print(response)
-            result = json.loads(response.content.strip())
+            result = json.loads(content.strip())
             logger.info(f"Query aligned: '{result.get('aligned_query')}' with keywords: {result.get('keywords')}")
             return result
         except json.JSONDecodeError:
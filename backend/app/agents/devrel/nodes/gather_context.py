@@ -29,6 +29,15 @@ async def gather_context_node(state: AgentState) -> Dict[str, Any]:
         "content": original_message,
         "timestamp": datetime.now().isoformat()
     }
+    new_messages = [new_message]
+
+    # A retried request already recorded its message in the failed attempt's checkpoint
+    message_id = state.context.get("message_id")
+    if message_id:
+        new_message["id"] = message_id
+        if any(message.get("id") == message_id for message in state.messages):
+            logger.info(f"Message {message_id} already in thread, not adding it again")
+            new_messages = []
 
     profile_data: Dict[str, Any] = dict(state.user_profile or {})
 
@@ -53,7 +62,7 @@ async def gather_context_node(state: AgentState) -> Dict[str, Any]:
 
     context_data = {
         "user_profile": profile_data or {"user_id": state.user_id, "platform": state.platform},
-        "conversation_context": len(state.messages) + 1,  # +1 for the new message
+        "conversation_context": len(state.messages) + len(new_messages),
         "session_info": {"session_id": state.session_id},
         "user_uuid": user_uuid
     }
@@ -70,7 +79,7 @@ async def gather_context_node(state: AgentState) -> Dict[str, Any]:
 
             # Populate state with previous conversation summary and topics
             return {
-                "messages": [new_message],
+                "messages": new_messages,
                 "context": {**state.context, **context_data},
                 "conversation_summary": prev_context.get("conversation_summary"),
                 "key_topics": prev_context.get("key_topics", []),
@@ -87,7 +96,7 @@ async def gather_context_node(state: AgentState) -> Dict[str, Any]:
     updated_context = {**state.context, **context_data}
 
     result: Dict[str, Any] = {
-        "messages": [new_message],
+        "messages": new_messages,
         "context": updated_context,
         "current_task": "context_gathered",
         "last_interaction_time": datetime.now(),
@@ -1,22 +1,29 @@
 import logging
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from app.agents.state import AgentState
+from app.agents.prompt_budget import history_section, json_section, text_section
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
 from ..prompts.response_prompt import RESPONSE_PROMPT
 from app.database.supabase.services import store_interaction
+from app.core.config import settings
+from app.core.llm import is_transient_llm_error
+from app.core.timing import session_timings
 
 logger = logging.getLogger(__name__)
 
-async def generate_response_node(state: AgentState, llm) -> Dict[str, Any]:
+async def generate_response_node(state: AgentState, llm, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
     """
     Final Response Generation Node
+
+    The run config is forwarded to the LLM call so its tokens reach
+    ``stream_mode="messages"`` consumers of the graph.
     """
     logger.info(f"Generating response for session {state.session_id}")
 
     try:
-        final_response = await _create_response(state, llm)
+        final_response = await _create_response(state, llm, config)
 
         # Store interaction to database
         await _store_interaction_to_db(state, final_response)
@@ -27,6 +34,10 @@ async def generate_response_node(state: AgentState, llm) -> Dict[str, Any]:
         }
 
     except Exception as e:
+        if is_transient_llm_error(e):
+            # Fail the run so the queue retries the request with backoff
+            logger.warning(f"Transient LLM error generating response: {str(e)}")
+            raise
         logger.error(f"Error generating response: {str(e)}")
         return {
             "final_response": "I apologize, but I encountered an error while generating my response. Please try asking your question again.",
@@ -34,29 +45,19 @@ async def generate_response_node(state: AgentState, llm) -> Dict[str, Any]:
             "current_task": "response_error"
         }
 
-async def _create_response(state: AgentState, llm) -> str:
+async def _create_response(state: AgentState, llm, config: Optional[RunnableConfig] = None) -> str:
     """
     Response Generation and LLM synthesis
     """
     logger.info(f"Creating response for session {state.session_id}")
 
-    latest_message = _get_latest_message(state)
-
-    conversation_summary = state.conversation_summary or "This is the beginning of our conversation."
+    latest_message = text_section(_get_latest_message(state), "latest_message")
 
-    recent_messages_count = min(10, len(state.messages))
-    conversation_history = ""
-    if state.messages:
-        conversation_history = "\n".join([
-            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-            for msg in state.messages[-recent_messages_count:]
-        ])
+    conversation_summary = text_section(
+        state.conversation_summary, "conversation_summary", default="This is the beginning of our conversation."
+    )
 
-        if len(state.messages) > recent_messages_count:
-            conversation_history = f"[Showing last {recent_messages_count} of {len(state.messages)} messages]\n" + \
-                conversation_history
-    else:
-        conversation_history = "No previous conversation"
+    conversation_history = history_section(state.messages, "conversation_history", max_messages=10)
 
     context_parts = [
         f"Platform: {state.platform}",
@@ -67,17 +68,17 @@ async def _create_response(state: AgentState, llm) -> str:
     if state.key_topics:
         context_parts.append(f"Key topics discussed: {', '.join(state.key_topics)}")
     if state.user_profile:
-        context_parts.append(f"User profile: {state.user_profile}")
+        context_parts.append(f"User profile: {json_section(state.user_profile, 'user_profile')}")
 
     current_context = "\n".join(context_parts)
 
-    supervisor_thinking = state.context.get("supervisor_thinking", "No reasoning process available")
+    supervisor_thinking = text_section(
+        state.context.get("supervisor_thinking"), "supervisor_thinking", default="No reasoning process available"
+    )
 
-    tool_results = state.context.get("tool_results", [])
-    tool_results_str = json.dumps(tool_results, indent=2) if tool_results else "No tool results"
+    tool_results_str = json_section(state.context.get("tool_results", []), "tool_results", default="No tool results")
 
-    task_result = state.task_result or {}
-    task_result_str = json.dumps(task_result, indent=2) if task_result else "No task result"
+    task_result_str = json_section(state.task_result, "task_result", default="No task result")
 
     try:
         prompt = RESPONSE_PROMPT.format(
@@ -96,7 +97,7 @@ async def _create_response(state: AgentState, llm) -> str:
         logger.error(f"Missing key in RESPONSE_PROMPT: {e}")
         return f"Error: Response template formatting error - {str(e)}"
 
-    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    response = await llm.ainvoke([HumanMessage(content=prompt)], config)
     return response.content.strip()
 
 def _get_latest_message(state: AgentState) -> str:
@@ -123,6 +124,17 @@ async def _store_interaction_to_db(state: AgentState, final_response: str) -> No
         # Modify prompt to include intent key
         intent = classification.get("reasoning")  # Fallback to reasoning for intent
 
+        metadata = {
+            "session_id": state.session_id,
+            "response": final_response[:500] if final_response else None,
+            "tools_used": state.tools_used,
+            "supervisor_llm_calls_saved": state.context.get("llm_calls_saved", 0),
+            "classification": classification
+        }
+        if settings.agent_timing_in_interactions:
+            # Timings of the nodes run so far; generate_response itself is still in progress
+            metadata["node_timings"] = session_timings(state.session_id)
+
         # Store the interaction
         await store_interaction(
             user_uuid=user_uuid,
@@ -134,12 +146,7 @@ async def _store_interaction_to_db(state: AgentState, final_response: str) -> No
             interaction_type="message",
             intent_classification=intent,
             topics_discussed=state.key_topics if state.key_topics else None,
-            metadata={
-                "session_id": state.session_id,
-                "response": final_response[:500] if final_response else None,
-                "tools_used": state.tools_used,
-                "classification": classification
-            }
+            metadata=metadata
         )
 
     except Exception as e:
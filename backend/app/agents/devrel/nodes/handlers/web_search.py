@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any
 from app.agents.state import AgentState
-from langchain_core.messages import HumanMessage
+from app.core.llm import cached_invoke
 from app.agents.devrel.prompts.search_prompt import EXTRACT_SEARCH_QUERY_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -16,8 +16,7 @@ async def _extract_search_query(message: str, llm) -> str:
     except KeyError as e:
         logger.error(f"Missing key in EXTRACT_SEARCH_QUERY_PROMPT: {e}")
         return message  # Fallback
-    response = await llm.ainvoke([HumanMessage(content=prompt)])
-    search_query = response.content.strip()
+    search_query = (await cached_invoke(llm, prompt, "search_query")).strip()
     logger.info(f"Extracted search query: {search_query}")
     return search_query
 
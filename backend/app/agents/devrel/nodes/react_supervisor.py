@@ -1,13 +1,18 @@
 import logging
-import json
-from typing import Dict, Any, Literal
+from typing import Dict, Any, List, Optional, Union
 from app.agents.state import AgentState
+from app.agents.prompt_budget import history_section, json_section, text_section
 from langchain_core.messages import HumanMessage
 from ..prompts.react_prompt import REACT_SUPERVISOR_PROMPT
+from .supervisor_rules import SupervisorRules
 
 logger = logging.getLogger(__name__)
 
-async def react_supervisor_node(state: AgentState, llm) -> Dict[str, Any]:
+TOOL_ACTIONS = ["web_search", "faq_handler", "onboarding", "github_toolkit"]
+# Actions that must run on their own rather than alongside other tools
+EXCLUSIVE_ACTIONS = {"onboarding", "complete"}
+
+async def react_supervisor_node(state: AgentState, llm, rules: Optional[SupervisorRules] = None) -> Dict[str, Any]:
     """ReAct Supervisor: Think -> Act -> Observe"""
     logger.info(f"ReAct Supervisor thinking for session {state.session_id}")
 
@@ -52,19 +57,44 @@ async def react_supervisor_node(state: AgentState, llm) -> Dict[str, Any]:
             "current_task": "supervisor_forced_complete",
         }
 
+    rule_decision = rules.decide(state, latest_message) if rules else None
+    if rule_decision:
+        logger.info(
+            "Supervisor rule %s decided %s (confidence %.2f) for session %s",
+            rule_decision.rule, rule_decision.action, rule_decision.confidence, state.session_id
+        )
+        decision = {
+            "action": rule_decision.action,
+            "actions": [rule_decision.action],
+            "reasoning": rule_decision.reasoning,
+            "thinking": "",
+            "confidence": rule_decision.confidence,
+            "rule": rule_decision.rule,
+        }
+        return {
+            "context": {
+                **state.context,
+                "supervisor_thinking": rule_decision.reasoning,
+                "supervisor_decision": decision,
+                "iteration_count": iteration_count + 1,
+                "llm_calls_saved": state.context.get("llm_calls_saved", 0) + 1
+            },
+            "current_task": f"supervisor_rule_{decision['action']}"
+        }
+
     prompt = REACT_SUPERVISOR_PROMPT.format(
-        latest_message=latest_message,
+        latest_message=text_section(latest_message, "latest_message"),
         platform=state.platform,
         interaction_count=state.interaction_count,
         iteration_count=iteration_count,
         conversation_history=conversation_history,
-        tool_results=json.dumps(tool_results, indent=2) if tool_results else "No previous tool results"
+        tool_results=json_section(tool_results, "tool_results", default="No previous tool results")
     )
 
     response = await llm.ainvoke([HumanMessage(content=prompt)])
     decision = _parse_supervisor_decision(response.content)
 
-    logger.info(f"ReAct Supervisor decision: {decision['action']}")
+    logger.info(f"ReAct Supervisor decision: {', '.join(decision['actions'])}")
 
     # Update state with supervisor's thinking
     return {
@@ -74,34 +104,42 @@ async def react_supervisor_node(state: AgentState, llm) -> Dict[str, Any]:
             "supervisor_decision": decision,
             "iteration_count": iteration_count + 1
         },
-        "current_task": f"supervisor_decided_{decision['action']}"
+        "current_task": f"supervisor_decided_{'+'.join(decision['actions'])}"
     }
 
 def _parse_supervisor_decision(response: str) -> Dict[str, Any]:
     """Parse the supervisor's decision from LLM response"""
     try:
         lines = response.strip().split('\n')
-        decision = {"action": "complete", "reasoning": "", "thinking": ""}
+        decision = {"action": "complete", "actions": ["complete"], "reasoning": "", "thinking": ""}
 
         for line in lines:
             if line.startswith("THINK:"):
                 decision["thinking"] = line.replace("THINK:", "").strip()
             elif line.startswith("ACT:"):
-                action = line.replace("ACT:", "").strip().lower()
-                if action in ["web_search", "faq_handler", "onboarding", "github_toolkit", "complete"]:
-                    decision["action"] = action
+                requested = line.replace("ACT:", "").replace("+", ",").strip().lower().split(",")
+                decision["actions"] = _normalize_actions([action.strip() for action in requested])
+                decision["action"] = decision["actions"][0]
             elif line.startswith("REASON:"):
                 decision["reasoning"] = line.replace("REASON:", "").strip()
 
         return decision
     except Exception as e:
         logger.error(f"Error parsing supervisor decision: {e}")
-        return {"action": "complete", "reasoning": "Error in decision parsing", "thinking": ""}
-
-def supervisor_decision_router(state: AgentState) -> Literal["web_search", "faq_handler", "onboarding", "github_toolkit", "complete"]:
-    """Route based on supervisor's decision"""
+        return {"action": "complete", "actions": ["complete"], "reasoning": "Error in decision parsing", "thinking": ""}
+
+def _normalize_actions(requested: List[str]) -> List[str]:
+    """Known, de-duplicated actions, with onboarding and complete never combined with others"""
+    actions = [action for action in dict.fromkeys(requested) if action in TOOL_ACTIONS or action == "complete"]
+    if "onboarding" in actions:
+        return ["onboarding"]
+    tools = [action for action in actions if action not in EXCLUSIVE_ACTIONS]
+    return tools or ["complete"]
+
+def supervisor_decision_router(state: AgentState) -> Union[str, List[str]]:
+    """Route based on supervisor's decision, fanning out to several tools at once"""
     decision = state.context.get("supervisor_decision", {})
-    action = decision.get("action", "complete")
+    actions = decision.get("actions") or [decision.get("action", "complete")]
 
     # Safety check for infinite loops
     iteration_count = state.context.get("iteration_count", 0)
@@ -109,24 +147,53 @@ def supervisor_decision_router(state: AgentState) -> Literal["web_search", "faq_
         logger.warning(f"Max iterations reached for session {state.session_id}")
         return "complete"
 
-    return action
+    return actions[0] if len(actions) == 1 else actions
 
-def add_tool_result(state: AgentState, tool_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
-    """Add tool result to state context"""
-    tool_results = state.context.get("tool_results", [])
-    tool_results.append({
-        "tool": tool_name,
-        "result": result,
-        "iteration": state.context.get("iteration_count", 0)
-    })
+def add_tool_result(state: AgentState, tool_name: str, result: Dict[str, Any],
+                    context_updates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Queue a tool result for the join node.
 
+    Tools may run in parallel, so they only append to ``tool_outputs``;
+    ``join_tool_results`` then applies them to the context. A ``None`` value
+    in ``context_updates`` removes that context key.
+    """
     return {
-        "context": {
-            **state.context,
-            "tool_results": tool_results
-        },
-        "tools_used": state.tools_used + [tool_name],
-        "current_task": f"completed_{tool_name}"
+        "tool_outputs": [{
+            "tool": tool_name,
+            "result": result,
+            "iteration": state.context.get("iteration_count", 0),
+            "context_updates": context_updates or {},
+        }]
+    }
+
+async def join_tool_results(state: AgentState) -> Dict[str, Any]:
+    """Merge the outputs of one tool fan-out into the ReAct context"""
+    context = {**state.context}
+    tool_results = list(context.get("tool_results", []))
+    tools_used = list(state.tools_used)
+
+    for output in state.tool_outputs:
+        tool_results.append({
+            "tool": output["tool"],
+            "result": output["result"],
+            "iteration": output["iteration"]
+        })
+        tools_used.append(output["tool"])
+        for key, value in output.get("context_updates", {}).items():
+            if value is None:
+                context.pop(key, None)
+            else:
+                context[key] = value
+
+    context["tool_results"] = tool_results
+    tools = [output["tool"] for output in state.tool_outputs]
+    logger.info(f"Joined results of {', '.join(tools) or 'no tools'} for session {state.session_id}")
+
+    return {
+        "context": context,
+        "tools_used": tools_used,
+        "tool_outputs": None,
+        "current_task": f"completed_{'+'.join(tools)}"
     }
 
 def _get_latest_message(state: AgentState) -> str:
@@ -137,11 +204,4 @@ def _get_latest_message(state: AgentState) -> str:
 
 def _get_conversation_history(state: AgentState, max_messages: int = 5) -> str:
     """Get formatted conversation history"""
-    if not state.messages:
-        return "No previous conversation"
-
-    recent_messages = state.messages[-max_messages:]
-    return "\n".join([
-        f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-        for msg in recent_messages
-    ])
+    return history_section(state.messages, "conversation_history", max_messages)
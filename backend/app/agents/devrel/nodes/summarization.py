@@ -1,10 +1,15 @@
+import json
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-from app.agents.state import AgentState
+from typing import Dict, Any, List, Optional, Tuple
+from app.agents.state import AgentState, evict_summarized, message_time
+from app.agents.prompt_budget import fit_messages, history_section, json_section, text_section
 from langchain_core.messages import HumanMessage
 from app.agents.devrel.prompts.summarization_prompt import CONVERSATION_SUMMARY_PROMPT
 from app.database.supabase.client import get_supabase_client
+from app.core.config import settings
+from app.core.timing import timed_db
 
 supabase = get_supabase_client()
 
@@ -15,8 +20,10 @@ def isoformat_or_none(dt: Optional[datetime]) -> Optional[str]:
 logger = logging.getLogger(__name__)
 
 # Configuration constants
-SUMMARIZATION_THRESHOLD = 15
+# Summarize at least once per message window; only summarized messages leave it
+SUMMARIZATION_THRESHOLD = min(15, settings.agent_message_window or 15)
 THREAD_TIMEOUT_HOURS = 1
+MAX_KEY_TOPICS = 5
 
 async def check_summarization_needed(state: AgentState) -> Dict[str, Any]:
     """
@@ -56,7 +63,17 @@ async def check_summarization_needed(state: AgentState) -> Dict[str, Any]:
 
 async def summarize_conversation_node(state: AgentState, llm) -> Dict[str, Any]:
     """
-    Summarize the conversation and update the state
+    Summarize the conversation and extract key topics in a single LLM call.
+
+    Only messages newer than the ``summarized_until`` watermark are sent,
+    together with the existing summary, so each cycle costs the same however
+    long the conversation has run. They are taken oldest first up to the
+    section budget and the watermark advances only past those; if any are
+    left over, ``summarization_needed`` stays set for another pass.
+
+    Runs outside the graph, after the response has been sent; the returned
+    updates are written back to the thread checkpoint by
+    ``DevRelAgent.summarize_thread``.
     """
     logger.info(f"Summarizing conversation for session {state.session_id}")
 
@@ -64,48 +81,52 @@ async def summarize_conversation_node(state: AgentState, llm) -> Dict[str, Any]:
         current_count = state.interaction_count
         logger.info(f"Summarizing at interaction count: {current_count}")
 
-        all_messages = state.messages
-
-        if not all_messages:
+        if not state.messages:
             logger.warning("No messages to summarize")
             return {"summarization_needed": False}
 
+        new_messages = _messages_since(state.messages, state.summarized_until)
+        if not new_messages:
+            logger.info(f"Summary already covers all messages for session {state.session_id}")
+            return {"interaction_count": -current_count, "summarization_needed": False}
+
         # Prepare conversation text
-        conversation_text = "\n".join([
-            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-            for msg in all_messages
-        ])
+        included = fit_messages(new_messages, "summary_conversation", oldest_first=True)
+        conversation_text = history_section(included, "summary_conversation")
 
         existing_summary = state.conversation_summary
         if not existing_summary or existing_summary == "This is the beginning of our conversation.":
             existing_summary = "No previous summary - this is the start of our conversation tracking."
+        existing_summary = text_section(existing_summary, "conversation_summary")
 
-        user_profile_text = str(state.user_profile) if state.user_profile else "No user profile."
-        topics_context = f"Previous topics: {', '.join(state.key_topics)}" if state.key_topics else "No previous topics."
+        user_profile_text = json_section(state.user_profile, "user_profile", default="No user profile.")
+        previous_topics = ", ".join(state.key_topics) if state.key_topics else "No previous topics."
 
         prompt = CONVERSATION_SUMMARY_PROMPT.format(
             existing_summary=existing_summary,
             recent_conversation=conversation_text,
-            user_profile=user_profile_text
+            user_profile=user_profile_text,
+            previous_topics=previous_topics
         )
 
-        prompt = prompt + f"\n\nPrevious topics discussed: {topics_context}"
-
-        logger.info(f"Generating summary with {len(all_messages)} messages, "
-                    f"conversation text length: {len(conversation_text)}")
+        logger.info(f"Generating summary with {len(included)} of {len(new_messages)} new messages "
+                    f"({len(state.messages)} in thread), conversation text length: {len(conversation_text)}")
 
         response = await llm.ainvoke([HumanMessage(content=prompt)])
-        new_summary = response.content.strip()
-
-        new_topics = await _extract_key_topics(new_summary, llm)
+        new_summary, new_topics = _parse_summary_response(response.content)
+        if not new_summary:
+            raise ValueError("Empty summary in LLM response")
 
         logger.info(f"Conversation summarized successfully for session {state.session_id}")
 
+        summarized_until = _latest_timestamp(included)
         return {
             "conversation_summary": new_summary,
             "interaction_count": -current_count,
-            "summarization_needed": False,
-            "key_topics": new_topics
+            "summarization_needed": len(included) < len(new_messages),
+            "key_topics": new_topics,
+            "summarized_until": summarized_until,
+            "messages": [evict_summarized(summarized_until or state.summarized_until or datetime.min)]
         }
 
     except Exception as e:
@@ -115,26 +136,36 @@ async def summarize_conversation_node(state: AgentState, llm) -> Dict[str, Any]:
             "summarization_needed": False
         }
 
-async def _extract_key_topics(summary: str, llm) -> list[str]:
-    """Extract key topics from the conversation summary"""
-    try:
-        topic_prompt = f"""Extract the key technical topics from this conversation summary.
-        Return only topic names separated by commas.
-        
-        Summary: {summary}
-        
-        Topics:"""
+def _messages_since(messages: List[Dict[str, Any]], watermark: Optional[datetime]) -> List[Dict[str, Any]]:
+    """Messages newer than ``watermark``; messages without a timestamp are always included"""
+    if watermark is None:
+        return messages
+    return [message for message in messages if (message_time(message) or datetime.max) > watermark]
 
-        response = await llm.ainvoke([HumanMessage(content=topic_prompt)])
-        topics_text = response.content.strip()
+def _latest_timestamp(messages: List[Dict[str, Any]]) -> Optional[datetime]:
+    timestamps = [timestamp for timestamp in map(message_time, messages) if timestamp]
+    return max(timestamps, default=None)
 
-        topics = [topic.strip() for topic in topics_text.split(',') if topic.strip()]
-        return topics[:5]  # Limiting to 5 topics
+def _parse_summary_response(content: str) -> Tuple[str, List[str]]:
+    """Summary and topics from the JSON response; plain text is taken as the summary alone"""
+    content = content.strip()
+    match = re.search(r"\{.*\}", content, re.DOTALL)
+    try:
+        result = json.loads(match.group() if match else content)
+    except json.JSONDecodeError:
+        logger.warning("Summary response was not valid JSON, using it as plain text")
+        return content, []
 
-    except Exception as e:
-        logger.error(f"Error extracting topics: {str(e)}")
-        return []
+    if not isinstance(result, dict):
+        return content, []
+
+    topics = result.get("key_topics") or []
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    topics = [str(topic).strip() for topic in topics if str(topic).strip()]
+    return str(result.get("summary") or "").strip(), topics[:MAX_KEY_TOPICS]
 
+@timed_db
 async def store_summary_to_database(state: AgentState) -> None:
     """Store the summary in Supabase database"""
     logger.info(f"Storing summary for session {state.session_id} into conversation_context")
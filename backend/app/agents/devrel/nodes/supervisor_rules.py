@@ -0,0 +1,164 @@
+"""
+Deterministic pre-decision rules for the ReAct supervisor.
+
+Each rule looks at the state and the latest message and either returns a
+``RuleDecision`` (an action plus a confidence in [0, 1]) or ``None``. The
+supervisor evaluates its rules in order before prompting the LLM and acts on
+the first decision whose confidence reaches
+``settings.supervisor_rule_min_confidence``; when none does, it falls through
+to the LLM. New rules are plain functions added to the list passed to
+``SupervisorRules``.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.agents.state import AgentState
+from app.core.config import settings
+from app.core.metrics import registry
+from app.agents.devrel.onboarding.workflow import OnboardingStage
+
+logger = logging.getLogger(__name__)
+
+LLM_CALLS_SAVED = registry.counter(
+    "devrai_supervisor_llm_calls_saved_total", "Supervisor decisions made by a rule instead of the LLM", ["rule"]
+)
+
+_GITHUB_ISSUE_URL = re.compile(
+    r"^<?https?://(www\.)?github\.com/[\w.-]+/[\w.-]+/issues/\d+/?(#[\w-]*)?>?$", re.IGNORECASE
+)
+_TRAILING_PUNCTUATION = "?!. "
+# Keys under which the GitHub toolkit's sub-tools return the data that answers a query
+_GITHUB_PAYLOAD_KEYS = ("response", "answer", "results", "issues", "repositories", "recommendations", "stats")
+
+
+@dataclass
+class RuleDecision:
+    action: str
+    confidence: float
+    reasoning: str
+    rule: str = ""
+
+
+Rule = Callable[[AgentState, str], Optional[RuleDecision]]
+
+
+def _tool_results(state: AgentState) -> List[Dict[str, Any]]:
+    return state.context.get("tool_results", [])
+
+
+def _normalize_question(message: str) -> str:
+    return " ".join(message.lower().split()).rstrip(_TRAILING_PUNCTUATION)
+
+
+def _has_github_payload(result: Dict[str, Any]) -> bool:
+    # repo_support puts the repository name under "repository", github_support its details
+    return any(result.get(key) for key in _GITHUB_PAYLOAD_KEYS) or isinstance(result.get("repository"), dict)
+
+
+def _answer_decision(tool_result: Dict[str, Any]) -> Optional[RuleDecision]:
+    tool = tool_result.get("tool")
+    result = tool_result.get("result") or {}
+
+    if tool == "faq_handler" and result.get("response"):
+        return RuleDecision("complete", 0.95, "FAQ answer found")
+    if tool == "github_toolkit" and result.get("status") != "error" and not result.get("error"):
+        if result.get("status") == "success" and _has_github_payload(result):
+            return RuleDecision("complete", 0.9, "GitHub toolkit returned data")
+        # e.g. an unindexed repository or no matching contributors: the LLM may retry another way
+        return RuleDecision("complete", 0.6, "GitHub toolkit returned no data")
+    if tool == "onboarding" and not result.get("next_tool"):
+        return RuleDecision("complete", 0.9, "Onboarding step produced the reply")
+    if tool == "web_search" and result.get("results"):
+        return RuleDecision("complete", 0.8, "Web search returned results")
+    return None
+
+
+def tool_results_answer_rule(state: AgentState, latest_message: str) -> Optional[RuleDecision]:
+    """Complete once a result of the latest tool round already answers the message"""
+    tool_results = _tool_results(state)
+    if not tool_results:
+        return None
+
+    # Tools chosen together share an iteration and are judged as one round
+    last_iteration = tool_results[-1].get("iteration")
+    decisions = [
+        _answer_decision(tool_result) for tool_result in tool_results
+        if tool_result.get("iteration") == last_iteration
+    ]
+    decisions = [decision for decision in decisions if decision is not None]
+    return max(decisions, key=lambda decision: decision.confidence, default=None)
+
+
+def onboarding_stage_rule(state: AgentState, latest_message: str) -> Optional[RuleDecision]:
+    """Continue an onboarding conversation that is waiting on the user"""
+    if _tool_results(state):
+        return None
+
+    stage = (state.onboarding_state or {}).get("stage")
+    if stage == OnboardingStage.AWAITING_CHOICE.value:
+        return RuleDecision("onboarding", 0.9, "Onboarding is awaiting the user's choice")
+    if stage == OnboardingStage.ENCOURAGE_VERIFICATION.value:
+        # The user may have moved on to an unrelated question, so let the LLM weigh in by default
+        return RuleDecision("onboarding", 0.7, "Onboarding is encouraging verification")
+    return None
+
+
+def github_issue_url_rule(state: AgentState, latest_message: str) -> Optional[RuleDecision]:
+    """Send a bare GitHub issue link to the GitHub toolkit"""
+    if _tool_results(state) or not _GITHUB_ISSUE_URL.match(latest_message.strip()):
+        return None
+    return RuleDecision("github_toolkit", 0.95, "Message is a GitHub issue URL")
+
+
+def faq_exact_match_rule(faq_tool) -> Rule:
+    """Rule answering exact FAQ questions from ``faq_tool.faq_responses``"""
+
+    def rule(state: AgentState, latest_message: str) -> Optional[RuleDecision]:
+        if _tool_results(state):
+            return None
+        if _normalize_question(latest_message) in faq_tool.faq_responses:
+            return RuleDecision("faq_handler", 1.0, "Message matches an FAQ question")
+        return None
+
+    rule.__name__ = "faq_exact_match_rule"
+    return rule
+
+
+def default_rules(faq_tool=None) -> List[Rule]:
+    rules: List[Rule] = [tool_results_answer_rule, onboarding_stage_rule, github_issue_url_rule]
+    if faq_tool is not None:
+        rules.append(faq_exact_match_rule(faq_tool))
+    return rules
+
+
+class SupervisorRules:
+    """Ordered rule set consulted by the supervisor before the LLM"""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+
+    def decide(self, state: AgentState, latest_message: str) -> Optional[RuleDecision]:
+        if not settings.supervisor_rules_enabled:
+            return None
+
+        for rule in self.rules:
+            name = getattr(rule, "__name__", type(rule).__name__)
+            try:
+                decision = rule(state, latest_message)
+            except Exception as e:
+                logger.warning(f"Supervisor rule {name} failed: {e}")
+                continue
+            if decision is None:
+                continue
+
+            decision.rule = decision.rule or name
+            if decision.confidence >= settings.supervisor_rule_min_confidence:
+                LLM_CALLS_SAVED.inc(rule=decision.rule)
+                return decision
+            logger.debug(
+                f"Supervisor rule {decision.rule} suggested {decision.action} "
+                f"below threshold ({decision.confidence:.2f})"
+            )
+        return None
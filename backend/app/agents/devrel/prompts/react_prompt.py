@@ -25,15 +25,20 @@ AVAILABLE ACTIONS:
 
 THINK: Analyze the user's request and current context. What needs to be done?
 
-Then choose ONE action:
+Then choose the action(s):
 - If you need external information or recent updates → web_search
 - If this is a common question with a known answer → faq_handler  
 - If this is a new user needing guidance → onboarding
 - If this involves GitHub repositories, issues, PRs, or code → github_toolkit
 - If you have enough information to fully answer → complete
 
+If the request needs several independent lookups, list them together
+(e.g. "web_search, github_toolkit") and they will run at the same time.
+Only web_search, faq_handler and github_toolkit can be combined;
+onboarding and complete must always be chosen alone.
+
 Respond in this exact format:
 THINK: [Your reasoning about what the user needs]
-ACT: [Choose one: web_search, faq_handler, onboarding, github_toolkit, complete]
+ACT: [One of: web_search, faq_handler, onboarding, github_toolkit, complete - or several of web_search, faq_handler, github_toolkit separated by commas]
 REASON: [Why you chose this action]
 """
@@ -3,16 +3,24 @@ CONVERSATION_SUMMARY_PROMPT = """You are a DevRel assistant. Create a concise su
 EXISTING SUMMARY:
 {existing_summary}
 
-RECENT CONVERSATION:
+NEW MESSAGES SINCE THE EXISTING SUMMARY:
 {recent_conversation}
 
 USER PROFILE:
 {user_profile}
 
+PREVIOUS TOPICS:
+{previous_topics}
+
 Instructions:
-1. Create a NEW summary combining existing and recent conversation
+1. Create a NEW summary combining the existing summary and the new messages
 2. Focus on user's technical interests, problems, and experience level
 3. Keep under 300 words
 4. Include relevant context for future interactions
+5. List up to 5 key technical topics discussed
 
-NEW SUMMARY:"""
+Respond with ONLY this JSON object:
+{{
+    "summary": "the new summary",
+    "key_topics": ["topic", "topic"]
+}}"""
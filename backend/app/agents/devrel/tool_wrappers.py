@@ -30,18 +30,17 @@ async def onboarding_tool_node(state: AgentState) -> Dict[str, Any]:
 
     handler_result = await handle_onboarding_node(state)
     tool_result = handler_result.get("task_result", {})
-    state_update = add_tool_result(state, "onboarding", tool_result)
 
-    if "onboarding_state" in handler_result:
-        state_update["onboarding_state"] = handler_result["onboarding_state"]
-
-    context = dict(state_update.get("context", {}))
+    context_updates = {}
     next_tool = tool_result.get("next_tool")
     if next_tool:
-        context["force_next_tool"] = next_tool
+        context_updates["force_next_tool"] = next_tool
         if tool_result.get("stage") in {"verified_capabilities", "completed"}:
-            context["complete_after_forced_tool"] = next_tool
-    state_update["context"] = context
+            context_updates["complete_after_forced_tool"] = next_tool
+
+    state_update = add_tool_result(state, "onboarding", tool_result, context_updates)
+    if "onboarding_state" in handler_result:
+        state_update["onboarding_state"] = handler_result["onboarding_state"]
 
     return state_update
 
@@ -67,12 +66,9 @@ async def github_toolkit_tool_node(state: AgentState, github_toolkit) -> Dict[st
             "status": "error"
         }
 
-    state_update = add_tool_result(state, "github_toolkit", tool_result)
+    context_updates = {}
+    if state.context.get("complete_after_forced_tool") == "github_toolkit":
+        context_updates["complete_after_forced_tool"] = None
+        context_updates["force_complete"] = True
 
-    context = dict(state_update.get("context", {}))
-    if context.get("complete_after_forced_tool") == "github_toolkit":
-        context.pop("complete_after_forced_tool", None)
-        context["force_complete"] = True
-    state_update["context"] = context
-
-    return state_update
+    return add_tool_result(state, "github_toolkit", tool_result, context_updates)
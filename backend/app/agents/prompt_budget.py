@@ -0,0 +1,148 @@
+"""
+Token-budgeted prompt sections.
+
+Each variable part of an agent prompt is rendered through one of the
+``*_section`` helpers, which count its tokens and deterministically compact
+or truncate it to the section's budget. Budgets default to
+``DEFAULT_SECTION_BUDGETS`` and can be overridden per section with
+``settings.prompt_section_budgets``.
+
+Tokens are counted with tiktoken's ``cl100k_base`` encoding when installed
+(a close proxy for Gemini's tokenizer), else estimated at four characters
+per token.
+"""
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional, falls back to a character estimate
+    tiktoken = None
+
+DEFAULT_SECTION_BUDGETS = {
+    "latest_message": 1000,
+    "conversation_history": 1500,
+    "conversation_summary": 800,
+    "user_profile": 300,
+    "supervisor_thinking": 500,
+    "tool_results": 2000,
+    "task_result": 1500,
+    "summary_conversation": 4000,
+}
+
+# JSON compaction limits applied before token truncation
+MAX_LIST_ITEMS = 10
+MAX_STRING_CHARS = 500
+
+TRUNCATION_MARKER = "... [truncated]"
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def section_budget(section: str) -> int:
+    return settings.prompt_section_budgets.get(section, DEFAULT_SECTION_BUDGETS[section])
+
+
+def fit_text(text: str, budget: int, keep_tail: bool = False) -> str:
+    """Cut ``text`` to ``budget`` tokens, keeping its start (or end)"""
+    if count_tokens(text) <= budget:
+        return text
+    encoding = _encoding()
+    available = max(0, budget - count_tokens(TRUNCATION_MARKER))
+    if encoding is None:
+        chars = available * 4
+        kept = text[-chars:] if keep_tail else text[:chars]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        kept = encoding.decode(tokens[-available:] if keep_tail else tokens[:available]) if available else ""
+    return f"{TRUNCATION_MARKER}{kept}" if keep_tail else f"{kept}{TRUNCATION_MARKER}"
+
+
+def text_section(text: Optional[str], section: str, default: str = "", keep_tail: bool = False) -> str:
+    if not text:
+        return default
+    return fit_text(text, section_budget(section), keep_tail)
+
+
+def _compact(value: Any) -> Any:
+    """Shorten long lists and strings so large tool payloads shrink predictably"""
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_compact(item) for item in value[:MAX_LIST_ITEMS]]
+        if len(value) > MAX_LIST_ITEMS:
+            items.append(f"... {len(value) - MAX_LIST_ITEMS} more")
+        return items
+    if isinstance(value, str) and len(value) > MAX_STRING_CHARS:
+        return value[:MAX_STRING_CHARS] + TRUNCATION_MARKER
+    return value
+
+
+def json_section(value: Any, section: str, default: str = "") -> str:
+    """Compact JSON of ``value`` within the section budget"""
+    if not value:
+        return default
+    text = json.dumps(_compact(value), separators=(",", ":"), ensure_ascii=False, default=str)
+    return fit_text(text, section_budget(section))
+
+
+def _message_line(message: Dict[str, Any]) -> str:
+    return f"{message.get('role', 'user')}: {message.get('content', '')}"
+
+
+def fit_messages(messages: List[Dict[str, Any]], section: str, oldest_first: bool = False) -> List[Dict[str, Any]]:
+    """The newest (or oldest) messages, whole, that fit the section budget, in their original order.
+
+    The first message taken is kept even when it alone exceeds the budget;
+    ``history_section`` then cuts it to fit.
+    """
+    budget = section_budget(section)
+    kept: List[Dict[str, Any]] = []
+    used = 0
+    for message in (messages if oldest_first else reversed(messages)):
+        tokens = count_tokens(_message_line(message)) + 1
+        if kept and used + tokens > budget:
+            break
+        kept.append(message)
+        used += tokens
+    return kept if oldest_first else kept[::-1]
+
+
+def history_section(messages: List[Dict[str, Any]], section: str, max_messages: Optional[int] = None,
+                    default: str = "No previous conversation", oldest_first: bool = False) -> str:
+    """Most recent (or, with ``oldest_first``, earliest) messages, whole, that fit the section budget"""
+    if not messages:
+        return default
+    if max_messages:
+        candidates = messages[:max_messages] if oldest_first else messages[-max_messages:]
+    else:
+        candidates = messages
+    lines = [_message_line(message) for message in fit_messages(candidates, section, oldest_first)]
+    if len(lines) == 1:
+        lines[0] = fit_text(lines[0], section_budget(section))
+    if len(lines) < len(messages):
+        shown = "first" if oldest_first else "last"
+        lines.insert(0, f"[Showing {shown} {len(lines)} of {len(messages)} messages]")
+    return "\n".join(lines)
@@ -2,6 +2,7 @@ from typing import Dict, Any, List, Optional, Annotated
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from operator import add
+from app.core.config import settings
 
 def replace_summary(existing: Optional[str], new: Optional[str]) -> Optional[str]:
     """Replace summary"""
@@ -9,6 +10,65 @@ def replace_summary(existing: Optional[str], new: Optional[str]) -> Optional[str
         return new
     return existing
 
+def advance_watermark(existing: Optional[datetime], new: Optional[datetime]) -> Optional[datetime]:
+    """Move the summarization watermark forward only"""
+    if new is None:
+        return existing
+    if existing is None:
+        return new
+    return max(existing, new)
+
+
+# Key of a ``messages`` update entry that evicts summarized messages instead of appending
+EVICT_SUMMARIZED_KEY = "evict_summarized_through"
+
+def message_time(message: Dict[str, Any]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(message["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def evict_summarized(watermark: Optional[datetime]) -> Dict[str, Any]:
+    """``messages`` update entry letting the window drop messages summarized up to ``watermark``"""
+    return {EVICT_SUMMARIZED_KEY: watermark}
+
+def window_messages(existing: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Append messages, keeping the latest ``agent_message_window`` verbatim.
+
+    Only messages already carried by ``conversation_summary`` are ever
+    dropped: an ``evict_summarized(watermark)`` entry, sent by summarization,
+    evicts the oldest messages at or before the watermark until the window
+    fits. Unsummarized messages are kept however many accumulate, so a failed
+    summary loses nothing. Messages without a timestamp are part of every
+    summary and count as covered.
+    """
+    if not new:
+        return existing
+
+    messages = list(existing)
+    watermark = None
+    for message in new:
+        if EVICT_SUMMARIZED_KEY in message:
+            watermark = message[EVICT_SUMMARIZED_KEY]
+        else:
+            messages.append(message)
+
+    limit = settings.agent_message_window
+    if watermark is None or limit <= 0:
+        return messages
+
+    evicted = 0
+    while len(messages) - evicted > limit and (message_time(messages[evicted]) or watermark) <= watermark:
+        evicted += 1
+    return messages[evicted:]
+
+def collect_tool_outputs(existing: List[Dict[str, Any]],
+                         new: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Gather outputs of tools running in parallel; ``None`` clears them after the join"""
+    if new is None:
+        return []
+    return existing + new
+
 def replace_topics(existing: List[str], new: List[str]) -> List[str]:
     """Replace topics"""
     if new:
@@ -23,7 +83,7 @@ class AgentState(BaseModel):
     platform: str  # discord, slack, github
 
     # Conversation context
-    messages: Annotated[List[Dict[str, Any]], add] = Field(default_factory=list)
+    messages: Annotated[List[Dict[str, Any]], window_messages] = Field(default_factory=list)
     context: Dict[str, Any] = Field(default_factory=dict)
 
     # Channel-specific conversation state (e.g., onboarding workflow progress)
@@ -35,6 +95,9 @@ class AgentState(BaseModel):
     # LLM-generated summary of PAST conversations
     conversation_summary: Annotated[Optional[str], replace_summary] = None
 
+    # Timestamp of the newest message already covered by conversation_summary
+    summarized_until: Annotated[Optional[datetime], advance_watermark] = None
+
     # Key topics discussed with the user
     key_topics: Annotated[List[str], replace_topics] = Field(default_factory=list)
 
@@ -54,6 +117,8 @@ class AgentState(BaseModel):
 
     # Tools and capabilities
     tools_used: List[str] = Field(default_factory=list)
+    # Outputs of the current tool fan-out, merged into context by the join node
+    tool_outputs: Annotated[List[Dict[str, Any]], collect_tool_outputs] = Field(default_factory=list)
     available_tools: List[str] = Field(default_factory=list)
 
     # Human-in-the-loop
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from .v1.auth import router as auth_router
 from .v1.health import router as health_router
 from .v1.integrations import router as integrations_router
+from .v1.metrics import router as metrics_router
 
 api_router = APIRouter()
 
@@ -17,6 +18,12 @@ api_router.include_router(
     tags=["Health"]
 )
 
+api_router.include_router(
+    metrics_router,
+    prefix="/v1",
+    tags=["Metrics"]
+)
+
 api_router.include_router(
     integrations_router,
     prefix="/v1/integrations",
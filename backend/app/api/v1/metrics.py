@@ -0,0 +1,30 @@
+import logging
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.core.dependencies import get_app_instance
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from main import DevRAIApplication
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(app_instance: "DevRAIApplication" = Depends(get_app_instance)):
+    """
+    Queue and worker metrics in Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Enqueue counts, queue depth, time-in-queue and
+        handler latency histograms, and per-handler error counts
+    """
+    try:
+        await app_instance.queue_manager.collect_metrics()
+    except Exception as e:
+        # Still serve the counters and histograms if the broker can't be reached
+        logger.error(f"Failed to collect queue metrics: {e}")
+
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,8 +1,7 @@
 import logging
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
 from app.core.config import settings
+from app.core.llm import cached_invoke, get_llm
 from .prompt import DEVREL_TRIAGE_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -11,11 +10,7 @@ class ClassificationRouter:
     """Simple DevRel triage - determines if message needs DevRel assistance"""
 
     def __init__(self, llm_client=None):
-        self.llm = llm_client or ChatGoogleGenerativeAI(
-            model=settings.classification_agent_model,
-            temperature=0.1,
-            google_api_key=settings.gemini_api_key
-        )
+        self.llm = llm_client or get_llm(settings.classification_agent_model, temperature=0.1)
 
     async def should_process_message(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Simple triage: Does this message need DevRel assistance?"""
@@ -25,9 +20,10 @@ class ClassificationRouter:
                 context=context or 'No additional context'
             )
 
-            response = await self.llm.ainvoke([HumanMessage(content=triage_prompt)])
-
-            response_text = response.content.strip()
+            # Keyed on the message alone: the context only carries ids
+            response_text = (await cached_invoke(
+                self.llm, triage_prompt, "triage", cache_key=message, cacheable=lambda text: "{" in text
+            )).strip()
             if '{' in response_text:
                 json_start = response_text.find('{')
                 json_end = response_text.rfind('}') + 1
@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from pydantic import field_validator, ConfigDict
-from typing import Optional
+from typing import Dict, Optional
 
 load_dotenv()
 
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     # Platforms
     github_token: str = ""
     discord_bot_token: str = ""
+    # Progressively edit the Discord "processing" message as the response streams in
+    discord_stream_responses: bool = True
+    discord_stream_edit_interval_seconds: float = 1.0
 
     # DB configuration
     supabase_url: str
@@ -32,9 +35,97 @@ class Settings(BaseSettings):
     classification_agent_model: str = "gemini-2.0-flash"
     agent_timeout: int = 30
     max_retries: int = 3
+    # Set to false when agents run in separate processes (agent_worker.py);
+    # the API process then only handles Discord ingress and egress.
+    run_agents_in_process: bool = True
+    agent_worker_processes: int = 2
+    # Worker N serves its Prometheus metrics on this port + N (0 = disabled)
+    agent_worker_metrics_port: int = 9100
+    # Conversation memory: "sqlite", "postgres" or "memory"
+    agent_checkpointer: str = "sqlite"
+    agent_checkpoint_path: str = "data/checkpoints.sqlite"
+    agent_checkpoint_postgres_url: str = ""
+    # Recently active threads whose latest checkpoint is kept in memory
+    agent_checkpoint_cache_size: int = 256
+    # Checkpoints retained per thread
+    agent_checkpoint_history: int = 5
+    # Messages kept verbatim in agent state; older ones live on in the summary (0 = unbounded)
+    agent_message_window: int = 20
+
+    # Shared LLM clients: concurrent Gemini calls overall and per model,
+    # e.g. LLM_MODEL_CONCURRENCY='{"gemini-2.5-flash": 4}'
+    llm_max_concurrency: int = 16
+    llm_model_max_concurrency: int = 8
+    llm_model_concurrency: Dict[str, int] = {}
+    # Response cache for deterministic prompts (triage, intent, query extraction);
+    # set LLM_CACHE_PATH to add a SQLite tier that survives restarts
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: float = 3600.0
+    llm_cache_max_entries: int = 2048
+    llm_cache_path: str = ""
+    # Token budgets overriding DEFAULT_SECTION_BUDGETS in app/agents/prompt_budget.py,
+    # e.g. PROMPT_SECTION_BUDGETS='{"tool_results": 3000}'
+    prompt_section_budgets: Dict[str, int] = {}
+    # Deterministic supervisor rules that skip the LLM decision when confident enough
+    supervisor_rules_enabled: bool = True
+    supervisor_rule_min_confidence: float = 0.85
+    # Attach per-node timings of each run to the stored interaction metadata
+    agent_timing_in_interactions: bool = False
+    # Background sweep of threads idle beyond the thread timeout
+    agent_idle_sweep_interval_seconds: float = 300.0
+    agent_idle_sweep_concurrency: int = 4
+    agent_idle_sweep_batch_size: int = 100
+
+    # Queue configuration
+    # "rabbitmq", or "memory" for an in-process broker-less backend (single node only)
+    queue_backend: str = "rabbitmq"
 
     # RabbitMQ configuration
     rabbitmq_url: Optional[str] = None
+    # Unacked deliveries the broker may push ahead of processing, per worker slot:
+    # each queue's consumer prefetches this times queue_max_workers
+    queue_prefetch_count: int = 2
+    # Agent task queues are split by memory thread into this many shards, each
+    # consumed by one agent worker process; needs at least agent_worker_processes
+    queue_shards: int = 8
+    # Use one x-max-priority queue instead of one queue per priority.
+    # Pair with a low prefetch count for strict ordering.
+    queue_native_priority: bool = False
+    # Payload codec for published messages: "json" or "msgpack". Consumers decode
+    # by content type; switch to msgpack only once every consumer is upgraded.
+    queue_codec: str = "json"
+    # Publishes awaited together by enqueue_many
+    queue_publish_batch_size: int = 500
+    # Worker autoscaling
+    queue_autoscale: bool = True
+    queue_min_workers: int = 2
+    queue_max_workers: int = 16
+    queue_autoscale_interval_seconds: float = 5.0
+    queue_target_wait_seconds: float = 2.0
+    # Concurrently running LLM-bound handlers across all workers
+    queue_max_llm_concurrency: int = 8
+    # Handler retries before a message is dead-lettered
+    queue_max_attempts: int = 4
+    queue_retry_base_delay_seconds: float = 2.0
+    queue_retry_max_delay_seconds: float = 60.0
+    # Dead letters retained by the in-process backend
+    queue_dead_letter_max: int = 1000
+    # Dedup window for redelivered messages: "memory", "supabase" or "none"
+    queue_dedup_backend: str = "memory"
+    queue_dedup_window_seconds: float = 3600.0
+    queue_dedup_max_entries: int = 10_000
+    # A claim older than this is presumed abandoned by a crashed worker
+    queue_dedup_claim_timeout_seconds: float = 600.0
+    queue_dedup_recheck_seconds: int = 15
+
+    # Ingress admission control
+    ingress_user_rate_per_minute: float = 6
+    ingress_user_burst: int = 5
+    ingress_guild_rate_per_minute: float = 120
+    ingress_guild_burst: int = 30
+    # Task backlog above which LOW priority requests are turned away
+    ingress_shed_queue_depth: int = 100
+    ingress_backlog_refresh_seconds: float = 1.0
 
     # Backend URL
     backend_url: str = ""
@@ -0,0 +1,4 @@
+from .registry import SharedLLMClient, get_llm, is_transient_llm_error, llm_stats
+from .cache import cached_invoke
+
+__all__ = ["SharedLLMClient", "get_llm", "is_transient_llm_error", "llm_stats", "cached_invoke"]
@@ -0,0 +1,165 @@
+"""
+Response cache for deterministic LLM prompts.
+
+Low-temperature classification and extraction prompts see the same inputs
+over and over. ``cached_invoke`` keys the response text by model,
+temperature and a hash of the whitespace- and case-normalized prompt, and
+serves repeats from an in-memory LRU with a TTL, backed by an optional
+SQLite tier (``llm_cache_path``) that survives restarts and is shared by
+processes on one host. Concurrent misses for one key share a single call.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_REQUESTS = registry.counter(
+    "devrai_llm_cache_requests_total", "LLM response cache lookups", ["call_site", "result"]
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _WHITESPACE.sub(" ", prompt).strip().casefold()
+
+
+class LLMResponseCache:
+    """TTL LRU of response texts with an optional SQLite tier"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, path: str = ""):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str) -> Tuple[Optional[str], str]:
+        """Cached text for ``key`` and the tier it came from ("memory", "disk" or "miss")"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                return entry[1], "memory"
+            del self._entries[key]
+
+        if self.path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                self._remember(key, row[1], row[0])
+                return row[1], "disk"
+        return None, "miss"
+
+    async def set(self, key: str, content: str):
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, content, expires_at)
+        if self.path:
+            await asyncio.to_thread(self._disk_set, key, content, expires_at)
+
+    async def shared(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        """Result of ``call()``, run once for all concurrent callers missing ``key``"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the call others are waiting on
+        return await asyncio.shield(task)
+
+    def _remember(self, key: str, content: str, expires_at: float):
+        self._entries[key] = (expires_at, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        try:
+            return self._connection().execute(
+                "SELECT expires_at, content FROM llm_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, content: str, expires_at: float):
+        try:
+            db = self._connection()
+            db.execute("INSERT OR REPLACE INTO llm_cache (key, content, expires_at) VALUES (?, ?, ?)",
+                       (key, content, expires_at))
+            db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMResponseCache(
+            settings.llm_cache_ttl_seconds, settings.llm_cache_max_entries, settings.llm_cache_path
+        )
+    return _cache
+
+
+async def cached_invoke(llm, prompt: str, call_site: str, cache_key: Optional[str] = None,
+                        cacheable: Optional[Callable[[str], bool]] = None) -> str:
+    """Response text of ``prompt``, served from the cache when possible.
+
+    ``cache_key`` replaces the prompt as the cache identity when the prompt
+    carries details that don't affect the answer (e.g. user ids). Responses
+    rejected by ``cacheable`` are returned but not stored.
+    """
+    if not settings.llm_cache_enabled:
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
+        return response.content
+
+    model = getattr(llm, "model", type(llm).__name__)
+    temperature = getattr(llm, "temperature", None)
+    identity = normalize_prompt(cache_key if cache_key is not None else prompt)
+    key = hashlib.sha256(f"{model}|{temperature}|{call_site}|{identity}".encode()).hexdigest()
+
+    cache = get_llm_cache()
+    content, tier = await cache.get(key)
+    if content is not None:
+        LLM_CACHE_REQUESTS.inc(call_site=call_site, result=f"{tier}_hit")
+        return content
+    LLM_CACHE_REQUESTS.inc(call_site=call_site, result="miss")
+
+    return await cache.shared(key, lambda: _invoke_and_store(cache, key, llm, prompt, cacheable))
+
+
+async def _invoke_and_store(cache: LLMResponseCache, key: str, llm, prompt: str,
+                            cacheable: Optional[Callable[[str], bool]]) -> str:
+    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    content = response.content
+    if isinstance(content, str) and content.strip() and (cacheable is None or cacheable(content)):
+        await cache.set(key, content)
+    return content
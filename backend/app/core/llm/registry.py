@@ -0,0 +1,172 @@
+"""
+Process-wide registry of shared Gemini chat clients.
+
+Every component asks ``get_llm(model, temperature)`` for its client instead of
+building its own, so HTTP connections are reused and concurrent calls are
+capped: per model by ``llm_model_max_concurrency`` (overridable per model via
+``llm_model_concurrency``) and overall by ``llm_max_concurrency``.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.timing import record_llm
+
+logger = logging.getLogger(__name__)
+
+LLM_IN_FLIGHT = registry.gauge("devrai_llm_in_flight", "LLM calls currently running", ["model"])
+LLM_QUEUED = registry.gauge("devrai_llm_queued", "LLM calls waiting for a concurrency slot", ["model"])
+LLM_REQUESTS = registry.counter("devrai_llm_requests_total", "LLM calls started", ["model"])
+LLM_ERRORS = registry.counter("devrai_llm_errors_total", "LLM calls that raised", ["model"])
+LLM_SECONDS = registry.histogram("devrai_llm_call_seconds", "Duration of LLM calls, excluding queueing", ["model"])
+
+# HTTP statuses of LLM failures worth retrying later: timeouts, rate limits, server errors
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+_global_slots: Optional[asyncio.Semaphore] = None
+_model_slots: Dict[str, asyncio.Semaphore] = {}
+_in_flight: Dict[str, int] = {}
+_queued: Dict[str, int] = {}
+_clients: Dict[Tuple[str, float], "SharedLLMClient"] = {}
+
+
+def _slots_for(model: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(settings.llm_max_concurrency)
+    if model not in _model_slots:
+        limit = settings.llm_model_concurrency.get(model, settings.llm_model_max_concurrency)
+        _model_slots[model] = asyncio.Semaphore(limit)
+    return _model_slots[model], _global_slots
+
+
+def is_transient_llm_error(error: BaseException) -> bool:
+    """Whether a failed LLM call may succeed if retried later.
+
+    Gemini API errors carry their HTTP status as ``code``; rate limits,
+    overload and server errors are transient, bad requests are not.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return isinstance(code, int) and code in TRANSIENT_STATUS_CODES
+
+
+class _Slot:
+    """Holds a model slot and a global slot for the duration of one call"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def __aenter__(self):
+        model_slots, global_slots = _slots_for(self.model)
+        self._change(_queued, LLM_QUEUED, 1)
+        try:
+            # Take the model slot first so a saturated model doesn't hold global slots
+            await model_slots.acquire()
+            try:
+                await global_slots.acquire()
+            except BaseException:
+                model_slots.release()
+                raise
+        finally:
+            self._change(_queued, LLM_QUEUED, -1)
+        self._change(_in_flight, LLM_IN_FLIGHT, 1)
+        LLM_REQUESTS.inc(model=self.model)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._change(_in_flight, LLM_IN_FLIGHT, -1)
+        model_slots, global_slots = _slots_for(self.model)
+        global_slots.release()
+        model_slots.release()
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            LLM_ERRORS.inc(model=self.model)
+        return False
+
+    def _change(self, counts: Dict[str, int], gauge, delta: int):
+        counts[self.model] = counts.get(self.model, 0) + delta
+        gauge.set(counts[self.model], model=self.model)
+
+
+class SharedLLMClient:
+    """Concurrency-limited facade over one shared chat model instance.
+
+    Only ``ainvoke``, ``abatch`` and ``astream`` are exposed as calls, each
+    holding a concurrency slot. Other methods of the underlying
+    ``ChatGoogleGenerativeAI`` (sync calls, ``with_structured_output``,
+    ``bind_tools``...) would run outside the caps and are refused; plain
+    attributes are still delegated.
+    """
+
+    def __init__(self, model: str, temperature: float):
+        self.model = model
+        self.temperature = temperature
+        self.client = ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            google_api_key=settings.gemini_api_key
+        )
+
+    async def ainvoke(self, messages: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        async with _Slot(self.model):
+            started_at = time.perf_counter()
+            response = None
+            try:
+                response = await self.client.ainvoke(messages, config, **kwargs)
+                return response
+            finally:
+                self._record(time.perf_counter() - started_at, getattr(response, "usage_metadata", None))
+
+    async def abatch(self, inputs: List[Any], config: Optional[Dict[str, Any]] = None, **kwargs) -> List[Any]:
+        """One ``ainvoke`` per input, so a batch queues for slots like separate calls"""
+        return list(await asyncio.gather(*(self.ainvoke(messages, config, **kwargs) for messages in inputs)))
+
+    async def astream(self, messages: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[Any]:
+        async with _Slot(self.model):
+            started_at = time.perf_counter()
+            usage: Dict[str, int] = {}
+            try:
+                async for chunk in self.client.astream(messages, config, **kwargs):
+                    for key, value in (getattr(chunk, "usage_metadata", None) or {}).items():
+                        if isinstance(value, int):
+                            usage[key] = usage.get(key, 0) + value
+                    yield chunk
+            finally:
+                self._record(time.perf_counter() - started_at, usage)
+
+    def _record(self, seconds: float, usage: Optional[Dict[str, Any]]):
+        LLM_SECONDS.observe(seconds, model=self.model)
+        record_llm(seconds, usage)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self.client, name)
+        if callable(value):
+            raise AttributeError(
+                f"SharedLLMClient does not expose {name}(); use ainvoke, abatch or astream, "
+                f"which respect the LLM concurrency limits"
+            )
+        return value
+
+
+def get_llm(model: str, temperature: float) -> SharedLLMClient:
+    """Shared client for ``(model, temperature)``, created on first use"""
+    key = (model, float(temperature))
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = SharedLLMClient(model, temperature)
+        logger.info(f"Created shared LLM client for {model} (temperature {temperature})")
+    return client
+
+
+def llm_stats() -> Dict[str, Dict[str, int]]:
+    """In-flight and queued call counts per model"""
+    return {
+        model: {"in_flight": _in_flight.get(model, 0), "queued": _queued.get(model, 0)}
+        for model in sorted(set(_in_flight) | set(_queued))
+    }
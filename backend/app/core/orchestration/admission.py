@@ -0,0 +1,125 @@
+"""
+Admission control for platform ingress.
+
+Per-user and per-guild token buckets cap how fast any one source can feed
+the agent queues, and a global task-queue depth threshold sheds LOW priority
+requests while the workers are backed up.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.orchestration.queue_manager import QueuePriority
+
+if TYPE_CHECKING:
+    from app.core.orchestration.queue_manager import AsyncQueueManager
+
+logger = logging.getLogger(__name__)
+
+INGRESS_REJECTED = registry.counter(
+    "devrai_ingress_rejected_total", "Ingress messages rejected by admission control", ["reason"]
+)
+
+# Buckets tracked per scope before the least recently used are forgotten
+MAX_TRACKED_BUCKETS = 10_000
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def available(self, tokens: float = 1) -> bool:
+        """Whether ``tokens`` could be taken now, without taking them"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= tokens
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        if self.available(tokens):
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class _BucketScope:
+    """LRU-bounded set of token buckets sharing one configuration"""
+
+    def __init__(self, capacity: float, rate_per_minute: float):
+        self.capacity = capacity
+        self.rate = rate_per_minute / 60
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.capacity, self.rate)
+            if len(self._buckets) > MAX_TRACKED_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+
+class AdmissionController:
+    """Decides whether an ingress message may be enqueued"""
+
+    def __init__(self, queue_manager: "AsyncQueueManager"):
+        self.queue_manager = queue_manager
+        self._users = _BucketScope(settings.ingress_user_burst, settings.ingress_user_rate_per_minute)
+        self._guilds = _BucketScope(settings.ingress_guild_burst, settings.ingress_guild_rate_per_minute)
+        self._backlog = 0
+        self._backlog_checked_at = 0.0
+
+    def allow(self, user_id: str, guild_id: Optional[str] = None) -> bool:
+        """Take a token from the user's and the guild's bucket for a request bound for the agents.
+
+        Tokens are only taken once both buckets have one, so a request
+        rejected by either bucket costs nothing from the other.
+        """
+        user_bucket = self._users.bucket(user_id)
+        guild_bucket = self._guilds.bucket(guild_id) if guild_id else None
+        if not user_bucket.available():
+            INGRESS_REJECTED.inc(reason="user_rate")
+            logger.info(f"Rate limited user {user_id}")
+            return False
+        if guild_bucket is not None and not guild_bucket.available():
+            INGRESS_REJECTED.inc(reason="guild_rate")
+            logger.info(f"Rate limited guild {guild_id}")
+            return False
+        user_bucket.try_acquire()
+        if guild_bucket is not None:
+            guild_bucket.try_acquire()
+        return True
+
+    async def should_shed(self, priority: QueuePriority) -> bool:
+        """Reject LOW priority work while the task queues are over the depth threshold"""
+        if priority != QueuePriority.LOW:
+            return False
+        backlog = await self._current_backlog()
+        if backlog >= settings.ingress_shed_queue_depth:
+            INGRESS_REJECTED.inc(reason="shed")
+            logger.warning(f"Shedding LOW priority request, task backlog {backlog}")
+            return True
+        return False
+
+    async def _current_backlog(self) -> int:
+        """Task queue backlog, refreshed at most once per ``ingress_backlog_refresh_seconds``"""
+        now = time.monotonic()
+        if now - self._backlog_checked_at >= settings.ingress_backlog_refresh_seconds:
+            self._backlog_checked_at = now
+            try:
+                self._backlog = await self.queue_manager.get_task_backlog()
+            except Exception as e:
+                logger.error(f"Failed to read task backlog: {e}")
+        return self._backlog
@@ -1,14 +1,22 @@
+import asyncio
 import logging
+import time
 import uuid
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
 from app.agents.devrel.agent import DevRelAgent
 from app.agents.state import AgentState
-from app.core.orchestration.queue_manager import AsyncQueueManager
-from app.agents.devrel.nodes.summarization import store_summary_to_database
+from app.core.orchestration.queue_manager import AsyncQueueManager, QueuePriority
+from app.agents.devrel.nodes.summarization import store_summary_to_database, THREAD_TIMEOUT_HOURS
+from app.core.config import settings
+from app.core.llm import is_transient_llm_error
+from app.core.timing import discard_session_timings
 from langsmith import traceable
 
 logger = logging.getLogger(__name__)
 
+ERROR_REPLY = "I'm having trouble processing your request. Please try again."
+
 class AgentCoordinator:
     """Coordinates agent execution and response handling"""
 
@@ -16,21 +24,96 @@ class AgentCoordinator:
         self.queue_manager = queue_manager
         self.devrel_agent = DevRelAgent()
         self.active_sessions: Dict[str, AgentState] = {}
+        self._sweeper_task: Optional[asyncio.Task] = None
+        # Background summarizations by memory thread id
+        self._summarization_tasks: Dict[str, asyncio.Task] = {}
 
         self._register_handlers()
 
+    async def start(self):
+        """Start the idle-thread sweeper"""
+        if self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(self._sweep_idle_threads_periodically())
+
+    async def stop(self):
+        """Stop the sweeper and release agent resources once the queue workers have stopped"""
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+        if self._summarization_tasks:
+            await asyncio.gather(*self._summarization_tasks.values(), return_exceptions=True)
+        await self.devrel_agent.checkpointer.aclose()
+
+    async def _sweep_idle_threads_periodically(self):
+        while True:
+            await asyncio.sleep(settings.agent_idle_sweep_interval_seconds)
+            try:
+                await self.sweep_idle_threads()
+            except Exception as e:
+                logger.error(f"Idle thread sweep failed: {e}")
+
+    async def sweep_idle_threads(self) -> int:
+        """Persist summaries of threads idle beyond THREAD_TIMEOUT_HOURS and drop their memory.
+
+        Timeouts are otherwise only noticed when the user writes again, so
+        without this the memory of users who never return is kept forever.
+        Each process sweeps only the threads whose task shard it consumes; no
+        other process runs them, so skipping threads with work queued here
+        is enough to never clear a conversation mid-run. Returns the number
+        of threads cleared.
+        """
+        thread_ids = await self.devrel_agent.checkpointer.alist_thread_ids()
+        cutoff = datetime.now() - timedelta(hours=THREAD_TIMEOUT_HOURS)
+        slots = asyncio.Semaphore(settings.agent_idle_sweep_concurrency)
+
+        def busy(thread_id: str) -> bool:
+            return self.queue_manager.has_active_lane(thread_id) or thread_id in self._summarization_tasks
+
+        async def sweep(thread_id: str) -> bool:
+            if not self.queue_manager.owns_thread(thread_id) or busy(thread_id):
+                return False
+            async with slots:
+                state = await self.devrel_agent.get_thread_state(thread_id)
+                last_interaction = state.get("last_interaction_time")
+                # A message may have arrived while the state was loading
+                if not last_interaction or last_interaction > cutoff or busy(thread_id):
+                    return False
+                logger.info(f"Thread {thread_id} idle since {last_interaction}, clearing memory")
+                return await self.devrel_agent.clear_thread_memory(thread_id, force_clear=True)
+
+        cleared = 0
+        batch_size = settings.agent_idle_sweep_batch_size
+        for start in range(0, len(thread_ids), batch_size):
+            results = await asyncio.gather(*(sweep(thread_id) for thread_id in thread_ids[start:start + batch_size]))
+            cleared += sum(results)
+
+        if cleared:
+            logger.info(f"Idle thread sweep cleared {cleared} of {len(thread_ids)} threads")
+        return cleared
+
     def _register_handlers(self):
         """Register message handlers"""
-        self.queue_manager.register_handler("devrel_request", self._handle_devrel_request)
+        self.queue_manager.register_handler("devrel_request", self._handle_devrel_request, llm_bound=True)
         self.queue_manager.register_handler("clear_thread_memory", self._handle_clear_memory_request)
+        self.queue_manager.register_dead_letter_handler("devrel_request", self._handle_failed_devrel_request)
 
     @traceable(name="devrel_request_coordination", run_type="chain")
     async def _handle_devrel_request(self, message_data: Dict[str, Any]):
-        """Handle DevRel agent requests"""
+        """Handle DevRel agent requests.
+
+        Transient LLM failures are re-raised so the queue can retry them with
+        backoff; the user only gets an error reply once retries are exhausted.
+        Any other failure would fail again on retry, so the error reply is
+        sent straight away.
+        """
+        session_id = str(uuid.uuid4())
         try:
             # Extract memory thread ID (user_id for Discord)
             memory_thread_id = message_data.get("memory_thread_id") or message_data.get("user_id", "")
-            session_id = str(uuid.uuid4())
 
             initial_state = AgentState(
                 session_id=session_id,
@@ -40,26 +123,123 @@ class AgentCoordinator:
                 channel_id=message_data.get("channel_id"),
                 context={
                     "original_message": message_data.get("content", ""),
+                    "message_id": message_data.get("id"),
                     "classification": message_data.get("classification", {}),
                     "author": message_data.get("author", {})
                 }
             )
 
+            # The next run must see the summary of the previous one
+            await self._wait_for_summarization(memory_thread_id)
+
             # Run agent
             logger.info(f"Running DevRel agent for session {session_id} with memory thread {memory_thread_id}")
-            result_state = await self.devrel_agent.run(initial_state, memory_thread_id)
+            if settings.discord_stream_responses and initial_state.platform == "discord":
+                result_state = await self._run_streaming(initial_state, memory_thread_id, message_data)
+            else:
+                result_state = await self.devrel_agent.run(initial_state, memory_thread_id)
 
-            # Check if thread timeout was reached during processing
-            if result_state.memory_timeout_reached:
-                await self._handle_memory_timeout(memory_thread_id, result_state)
+            if not result_state.final_response and result_state.errors:
+                logger.error(f"DevRel agent failed for session {session_id}: {result_state.errors[-1]}")
+                await self._send_error_response(message_data, ERROR_REPLY)
+                return
 
             # Send response back to platform
             if result_state.final_response:
                 await self._send_response_to_platform(message_data, result_state.final_response)
 
+            # Summarize (and handle a thread timeout) off the response path
+            if result_state.summarization_needed or result_state.memory_timeout_reached:
+                self._schedule_summarization(memory_thread_id)
+
         except Exception as e:
+            if is_transient_llm_error(e):
+                logger.warning(f"Transient error handling DevRel request, will retry: {str(e)}")
+                raise
             logger.error(f"Error handling DevRel request: {str(e)}")
-            await self._send_error_response(message_data, "I'm having trouble processing your request. Please try again.")
+            await self._send_error_response(message_data, ERROR_REPLY)
+        finally:
+            discard_session_timings(session_id)
+
+    def _schedule_summarization(self, memory_thread_id: str):
+        if memory_thread_id in self._summarization_tasks:
+            return
+        task = asyncio.create_task(self._summarize_in_background(memory_thread_id))
+        self._summarization_tasks[memory_thread_id] = task
+        task.add_done_callback(lambda _: self._summarization_tasks.pop(memory_thread_id, None))
+
+    async def _wait_for_summarization(self, memory_thread_id: str):
+        task = self._summarization_tasks.get(memory_thread_id)
+        if task is not None:
+            logger.info(f"Waiting for pending summarization of thread {memory_thread_id}")
+            await asyncio.shield(task)
+
+    async def _summarize_in_background(self, memory_thread_id: str):
+        """Summarize the thread into its checkpoint, then store and clear it if it timed out"""
+        try:
+            state = await self.devrel_agent.summarize_thread(memory_thread_id)
+            if state and state.memory_timeout_reached:
+                await self._handle_memory_timeout(memory_thread_id, state)
+        except Exception as e:
+            logger.error(f"Background summarization failed for thread {memory_thread_id}: {str(e)}")
+
+    async def _run_streaming(self, initial_state: AgentState, memory_thread_id: str,
+                             message_data: Dict[str, Any]) -> AgentState:
+        """Run the agent, publishing the response text as it is generated.
+
+        Tokens of the generate_response LLM call are forwarded as
+        ``discord_response_stream`` messages at most once per
+        ``discord_stream_edit_interval_seconds``; the full response still goes
+        out as a regular ``discord_response`` afterwards.
+        """
+        stream_id = uuid.uuid4().hex[:8]
+        response_text = ""
+        sequence = 0
+        last_published = 0.0
+        final_values = None
+
+        async for step in self.devrel_agent.stream_run(
+            initial_state, memory_thread_id, stream_mode=["messages", "values"]
+        ):
+            if isinstance(step, dict):
+                raise RuntimeError(f"DevRel agent failed: {step.get('error')}")
+            mode, chunk = step
+            if mode == "values":
+                final_values = chunk
+                continue
+
+            message_chunk, metadata = chunk
+            if metadata.get("langgraph_node") != "generate_response" or not isinstance(message_chunk.content, str):
+                continue
+            response_text += message_chunk.content
+            now = time.monotonic()
+            if response_text.strip() and now - last_published >= settings.discord_stream_edit_interval_seconds:
+                sequence += 1
+                last_published = now
+                await self._publish_partial_response(message_data, response_text, stream_id, sequence)
+
+        if final_values is None:
+            raise RuntimeError("DevRel agent produced no state")
+        return AgentState(**final_values)
+
+    async def _publish_partial_response(self, original_message: Dict[str, Any], text: str,
+                                        stream_id: str, sequence: int):
+        try:
+            await self.queue_manager.enqueue({
+                "type": "discord_response_stream",
+                "thread_id": original_message.get("thread_id"),
+                "memory_thread_id": original_message.get("memory_thread_id"),
+                "original_message_id": original_message.get("id"),
+                "stream_id": stream_id,
+                "sequence": sequence,
+                "response": text
+            }, QueuePriority.HIGH)
+        except Exception as e:
+            logger.warning(f"Failed to publish partial response: {e}")
+
+    async def _handle_failed_devrel_request(self, message_data: Dict[str, Any]):
+        """Tell the user once a request has exhausted its retries"""
+        await self._send_error_response(message_data, ERROR_REPLY)
 
     async def _handle_clear_memory_request(self, message_data: Dict[str, Any]):
         """Handle requests to clear thread memory"""
@@ -73,7 +253,7 @@ class AgentCoordinator:
 
             logger.info(f"Clearing memory for thread {memory_thread_id}, reason: {cleanup_reason}")
 
-            # Clear from InMemorySaver
+            # Clear the thread's checkpoints
             success = await self.devrel_agent.clear_thread_memory(memory_thread_id, force_clear=True)
 
             if success:
@@ -85,14 +265,14 @@ class AgentCoordinator:
             logger.error(f"Error clearing memory: {str(e)}")
 
     async def _handle_memory_timeout(self, memory_thread_id: str, state: AgentState):
-        """Handle memory timeout - store to database and clear from InMemorySaver"""
+        """Handle memory timeout - store to database and clear the thread's checkpoints"""
         try:
             logger.info(f"Handling memory timeout for thread {memory_thread_id}")
 
             # Store final summary to database
             await store_summary_to_database(state)
 
-            # Clear from InMemorySaver
+            # Clear the thread's checkpoints
             await self.devrel_agent.clear_thread_memory(memory_thread_id, force_clear=True)
 
             logger.info(f"Memory timeout handled successfully for thread {memory_thread_id}")
@@ -111,6 +291,7 @@ class AgentCoordinator:
                     "thread_id": original_message.get("thread_id"),
                     "channel_id": original_message.get("channel_id"),
                     "response": response,
+                    "memory_thread_id": original_message.get("memory_thread_id"),
                     "original_message_id": original_message.get("id")
                 }
 
@@ -0,0 +1,74 @@
+"""
+Payload codecs for queue messages.
+
+Producers tag each message with the codec's ``content_type`` and consumers
+pick the decoder from that header, so producers and consumers on mixed
+versions keep working. Messages without a content type are legacy JSON.
+orjson and ormsgpack are used when installed; plain JSON is the fallback.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # pragma: no cover - optional codec
+    ormsgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+class QueueCodec:
+    """Encodes and decodes queue envelopes for one content type"""
+
+    def __init__(self, name: str, content_type: str,
+                 encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]):
+        self.name = name
+        self.content_type = content_type
+        self.encode = encode
+        self.decode = decode
+
+
+if orjson is not None:
+    _json_codec = QueueCodec("json", JSON_CONTENT_TYPE, orjson.dumps, orjson.loads)
+else:
+    _json_codec = QueueCodec(
+        "json", JSON_CONTENT_TYPE,
+        lambda payload: json.dumps(payload).encode(),
+        lambda body: json.loads(body.decode())
+    )
+
+_codecs_by_name: Dict[str, QueueCodec] = {"json": _json_codec}
+_codecs_by_content_type: Dict[str, QueueCodec] = {JSON_CONTENT_TYPE: _json_codec}
+
+if ormsgpack is not None:
+    _msgpack_codec = QueueCodec("msgpack", MSGPACK_CONTENT_TYPE, ormsgpack.packb, ormsgpack.unpackb)
+    _codecs_by_name["msgpack"] = _msgpack_codec
+    _codecs_by_content_type[MSGPACK_CONTENT_TYPE] = _msgpack_codec
+
+
+def get_codec(name: str) -> QueueCodec:
+    """Codec used for publishing; falls back to JSON if ``name`` is unavailable"""
+    codec = _codecs_by_name.get(name.lower())
+    if codec is None:
+        logger.warning(f"Queue codec '{name}' is not available, falling back to JSON")
+        return _json_codec
+    return codec
+
+
+def decode_payload(body: bytes, content_type: Optional[str]) -> Any:
+    """Decode a message body using the codec named by its content type"""
+    if not content_type:
+        return _json_codec.decode(body)
+    codec = _codecs_by_content_type.get(content_type)
+    if codec is None:
+        raise ValueError(f"Unsupported queue payload content type: {content_type}")
+    return codec.decode(body)
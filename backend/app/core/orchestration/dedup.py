@@ -0,0 +1,134 @@
+"""
+Dedup window for queue message ids.
+
+A worker claims a message id before dispatching it to its handler. Ids that
+completed within ``queue_dedup_window_seconds`` are redeliveries and are
+dropped; ids another worker is still processing are re-checked later.
+Failed attempts release their claim so retries and dead-letter replays run.
+
+The in-memory store only covers one process. The Supabase store is shared by
+every consumer process and needs ``backend/database/02_create_queue_dedup.sql``.
+"""
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimStatus(str, Enum):
+    CLAIMED = "claimed"
+    IN_FLIGHT = "in_flight"
+    COMPLETED = "completed"
+
+
+class DedupStore(ABC):
+    """Tracks message ids that are being processed or were processed recently"""
+
+    @abstractmethod
+    async def claim(self, message_id: str) -> ClaimStatus:
+        """Mark ``message_id`` in flight unless it already is or recently completed"""
+        pass
+
+    @abstractmethod
+    async def complete(self, message_id: str):
+        """Remember ``message_id`` as processed for the dedup window"""
+        pass
+
+    @abstractmethod
+    async def release(self, message_id: str):
+        """Forget ``message_id`` so a later delivery is processed again"""
+        pass
+
+
+class InMemoryDedupStore(DedupStore):
+    """LRU of message ids with per-entry expiry, bounded to ``max_entries``"""
+
+    def __init__(self, window_seconds: float, claim_timeout_seconds: float, max_entries: int):
+        self.window_seconds = window_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[ClaimStatus, float]]" = OrderedDict()
+
+    async def claim(self, message_id: str) -> ClaimStatus:
+        now = time.monotonic()
+        entry = self._entries.get(message_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        self._set(message_id, ClaimStatus.IN_FLIGHT, now + self.claim_timeout_seconds)
+        return ClaimStatus.CLAIMED
+
+    async def complete(self, message_id: str):
+        self._set(message_id, ClaimStatus.COMPLETED, time.monotonic() + self.window_seconds)
+
+    async def release(self, message_id: str):
+        self._entries.pop(message_id, None)
+
+    def _set(self, message_id: str, status: ClaimStatus, expires_at: float):
+        self._entries[message_id] = (status, expires_at)
+        self._entries.move_to_end(message_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SupabaseDedupStore(DedupStore):
+    """Dedup window shared across processes through the ``queue_message_claims`` table"""
+
+    TABLE = "queue_message_claims"
+
+    def __init__(self, window_seconds: float, claim_timeout_seconds: float):
+        from app.database.supabase.client import get_supabase_client
+
+        self.window_seconds = window_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.supabase = get_supabase_client()
+        self._last_prune = time.monotonic()
+
+    async def claim(self, message_id: str) -> ClaimStatus:
+        await self._maybe_prune()
+        response = await self.supabase.rpc("claim_queue_message", {
+            "p_message_id": message_id,
+            "p_claim_seconds": int(self.claim_timeout_seconds)
+        }).execute()
+        return ClaimStatus(response.data)
+
+    async def complete(self, message_id: str):
+        await self.supabase.rpc("complete_queue_message", {
+            "p_message_id": message_id,
+            "p_window_seconds": int(self.window_seconds)
+        }).execute()
+
+    async def release(self, message_id: str):
+        await self.supabase.table(self.TABLE).delete().eq("message_id", message_id).execute()
+
+    async def _maybe_prune(self):
+        """Drop expired rows at most once per window"""
+        now = time.monotonic()
+        if now - self._last_prune < self.window_seconds:
+            return
+        self._last_prune = now
+        try:
+            await self.supabase.rpc("prune_queue_message_claims", {}).execute()
+        except Exception as e:
+            logger.warning(f"Failed to prune queue message claims: {e}")
+
+
+def create_dedup_store() -> Optional[DedupStore]:
+    """Dedup store for ``settings.queue_dedup_backend``, or None when disabled"""
+    backend = settings.queue_dedup_backend.lower()
+    if backend == "none":
+        return None
+    if backend == "supabase":
+        return SupabaseDedupStore(settings.queue_dedup_window_seconds, settings.queue_dedup_claim_timeout_seconds)
+    if backend != "memory":
+        logger.warning(f"Unknown dedup backend '{settings.queue_dedup_backend}', using memory")
+    return InMemoryDedupStore(
+        settings.queue_dedup_window_seconds,
+        settings.queue_dedup_claim_timeout_seconds,
+        settings.queue_dedup_max_entries
+    )
@@ -0,0 +1,146 @@
+"""
+Per-node timing of agent graph runs.
+
+``timed_node`` wraps a graph node and records its wall time together with the
+LLM time, DB time and token counts spent inside it. LLM calls report through
+``record_llm`` (done by ``SharedLLMClient``) and database helpers through the
+``timed_db`` decorator; both attribute to the node running in the current
+context. Every node execution is observed into histograms on the metrics
+registry, and the timings of a session's nodes stay available through
+``session_timings`` until ``discard_session_timings`` is called.
+"""
+import functools
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+NODE_SECONDS = registry.histogram("devrai_agent_node_seconds", "Wall time of agent graph nodes", ["node"])
+NODE_LLM_SECONDS = registry.histogram(
+    "devrai_agent_node_llm_seconds", "Time agent graph nodes spent in LLM calls", ["node"]
+)
+NODE_DB_SECONDS = registry.histogram(
+    "devrai_agent_node_db_seconds", "Time agent graph nodes spent in database calls", ["node"]
+)
+NODE_TOKENS = registry.histogram(
+    "devrai_agent_node_tokens", "LLM tokens used by agent graph nodes", ["node", "type"], buckets=TOKEN_BUCKETS
+)
+DB_CALL_SECONDS = registry.histogram("devrai_db_call_seconds", "Duration of database calls", ["operation"])
+
+# Sessions whose timings are kept; older ones are dropped if never discarded
+MAX_TRACKED_SESSIONS = 1000
+
+
+@dataclass
+class NodeTiming:
+    node: str
+    started_at: float = field(default_factory=time.perf_counter)
+    wall_seconds: Optional[float] = None
+    llm_seconds: float = 0.0
+    db_seconds: float = 0.0
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Nodes still running report their time so far
+        wall_seconds = self.wall_seconds
+        if wall_seconds is None:
+            wall_seconds = time.perf_counter() - self.started_at
+        return {
+            "node": self.node,
+            "wall_seconds": round(wall_seconds, 4),
+            "llm_seconds": round(self.llm_seconds, 4),
+            "db_seconds": round(self.db_seconds, 4),
+            "llm_calls": self.llm_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+_current_node: ContextVar[Optional[NodeTiming]] = ContextVar("devrai_current_node", default=None)
+_sessions: "OrderedDict[str, List[NodeTiming]]" = OrderedDict()
+
+
+def _track(session_id: str, timing: NodeTiming):
+    timings = _sessions.setdefault(session_id, [])
+    _sessions.move_to_end(session_id)
+    timings.append(timing)
+    while len(_sessions) > MAX_TRACKED_SESSIONS:
+        _sessions.popitem(last=False)
+
+
+def session_timings(session_id: str) -> List[Dict[str, Any]]:
+    return [timing.as_dict() for timing in _sessions.get(session_id, [])]
+
+
+def discard_session_timings(session_id: str):
+    _sessions.pop(session_id, None)
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wrap an async graph node so each execution is timed.
+
+    The wrapper keeps the node's signature visible to LangGraph, so nodes
+    taking ``config`` still receive it.
+    """
+
+    @functools.wraps(node)
+    async def run(state, *args, **kwargs):
+        timing = NodeTiming(name)
+        session_id = getattr(state, "session_id", None)
+        if session_id:
+            _track(session_id, timing)
+        token = _current_node.set(timing)
+        try:
+            return await node(state, *args, **kwargs)
+        finally:
+            _current_node.reset(token)
+            timing.wall_seconds = time.perf_counter() - timing.started_at
+            NODE_SECONDS.observe(timing.wall_seconds, node=name)
+            NODE_LLM_SECONDS.observe(timing.llm_seconds, node=name)
+            NODE_DB_SECONDS.observe(timing.db_seconds, node=name)
+            if timing.llm_calls:
+                NODE_TOKENS.observe(timing.input_tokens, node=name, type="input")
+                NODE_TOKENS.observe(timing.output_tokens, node=name, type="output")
+            logger.debug(f"Node {name} for session {session_id}: {timing.as_dict()}")
+
+    return run
+
+
+def record_llm(seconds: float, usage: Optional[Dict[str, Any]] = None):
+    """Attribute one LLM call (and its ``usage_metadata``) to the running node"""
+    timing = _current_node.get()
+    if timing is None:
+        return
+    timing.llm_calls += 1
+    timing.llm_seconds += seconds
+    if usage:
+        timing.input_tokens += usage.get("input_tokens", 0) or 0
+        timing.output_tokens += usage.get("output_tokens", 0) or 0
+
+
+def timed_db(func: Callable) -> Callable:
+    """Time an async database helper and attribute it to the running node"""
+
+    @functools.wraps(func)
+    async def run(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started_at
+            DB_CALL_SECONDS.observe(seconds, operation=func.__name__)
+            timing = _current_node.get()
+            if timing is not None:
+                timing.db_seconds += seconds
+
+    return run
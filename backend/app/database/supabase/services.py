@@ -3,11 +3,13 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import uuid
 from app.database.supabase.client import get_supabase_client
+from app.core.timing import timed_db
 
 logger = logging.getLogger(__name__)
 supabase = get_supabase_client()
 
 
+@timed_db
 async def ensure_user_exists(
     user_id: str,
     platform: str,
@@ -81,6 +83,7 @@ async def ensure_user_exists(
         return None
 
 
+@timed_db
 async def store_interaction(
     user_uuid: str,
     platform: str,
@@ -157,6 +160,7 @@ async def store_interaction(
         return False
 
 
+@timed_db
 async def get_conversation_context(user_uuid: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve conversation context for a user.
@@ -3,10 +3,12 @@ from datetime import datetime
 from typing import Optional
 from app.database.supabase.client import get_supabase_client
 from app.models.database.supabase import User
+from app.core.timing import timed_db
 import logging
 
 logger = logging.getLogger(__name__)
 
+@timed_db
 async def get_or_create_user_by_discord(
     discord_id: str, display_name: str, discord_username: str, avatar_url: Optional[str]
 ) -> User:
@@ -4,9 +4,9 @@ from typing import List, Dict, Any, Optional
 import torch
 from pydantic import BaseModel
 from sentence_transformers import SentenceTransformer
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 from app.core.config import settings
+from app.core.llm import SharedLLMClient, get_llm
 from app.models.database.weaviate import WeaviateUserProfile
 from app.services.embedding_service.profile_summarization.prompts.summarization_prompt import PROFILE_SUMMARIZATION_PROMPT
 
@@ -51,15 +51,11 @@ class EmbeddingService:
         return self._model
 
     @property
-    def llm(self) -> ChatGoogleGenerativeAI:
+    def llm(self) -> SharedLLMClient:
         """Lazy-load LLM for profile summarization"""
         if self._llm is None:
             try:
-                self._llm = ChatGoogleGenerativeAI(
-                    model=settings.github_agent_model,
-                    temperature=0.3,
-                    google_api_key=settings.gemini_api_key
-                )
+                self._llm = get_llm(settings.github_agent_model, temperature=0.3)
                 logger.info("LLM initialized for profile summarization")
             except Exception as e:
                 logger.error(f"Error initializing LLM: {str(e)}")
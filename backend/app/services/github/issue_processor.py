@@ -1,9 +1,9 @@
 import logging
 from typing import List
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 
 from app.core.config import settings
+from app.core.llm import get_llm
 from app.services.embedding_service.service import EmbeddingService
 from app.services.github.user.profiling import GitHubUserProfiler
 from app.agents.devrel.github.prompts.contributor_recommendation.issue_summarization import ISSUE_SUMMARIZATION_PROMPT
@@ -20,11 +20,7 @@ class GitHubIssueProcessor:
         self.owner = owner
         self.repo = repo
         self.issue_number = issue_number
-        self.summarizer_llm = ChatGoogleGenerativeAI(
-            model=settings.github_agent_model,
-            temperature=0.1,
-            google_api_key=settings.gemini_api_key
-        )
+        self.summarizer_llm = get_llm(settings.github_agent_model, temperature=0.1)
         self.embedding_service = EmbeddingService()
 
     async def fetch_issue_content(self) -> str:
@@ -0,0 +1,49 @@
+-- Table for deduplicating queue message deliveries across consumer processes
+CREATE TABLE IF NOT EXISTS queue_message_claims (
+    message_id TEXT PRIMARY KEY,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('in_flight', 'completed')),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_queue_message_claims_expires_at ON queue_message_claims(expires_at);
+
+-- Claim a message id for processing.
+-- Returns 'claimed' if the caller now owns it, otherwise the status of the live claim.
+CREATE OR REPLACE FUNCTION claim_queue_message(p_message_id TEXT, p_claim_seconds INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    current_status TEXT;
+BEGIN
+    INSERT INTO queue_message_claims (message_id, status, expires_at)
+    VALUES (p_message_id, 'in_flight', NOW() + make_interval(secs => p_claim_seconds))
+    ON CONFLICT (message_id) DO UPDATE
+        SET status = 'in_flight', expires_at = EXCLUDED.expires_at
+        WHERE queue_message_claims.expires_at < NOW();
+
+    IF FOUND THEN
+        RETURN 'claimed';
+    END IF;
+
+    SELECT status INTO current_status FROM queue_message_claims WHERE message_id = p_message_id;
+    RETURN current_status;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Mark a message id as processed for the dedup window
+CREATE OR REPLACE FUNCTION complete_queue_message(p_message_id TEXT, p_window_seconds INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO queue_message_claims (message_id, status, expires_at)
+    VALUES (p_message_id, 'completed', NOW() + make_interval(secs => p_window_seconds))
+    ON CONFLICT (message_id) DO UPDATE
+        SET status = 'completed', expires_at = EXCLUDED.expires_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Remove expired claims
+CREATE OR REPLACE FUNCTION prune_queue_message_claims()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM queue_message_claims WHERE expires_at < NOW();
+END;
+$$ LANGUAGE plpgsql;
@@ -1,12 +1,23 @@
 import discord
 from discord.ext import commands
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, Optional
+from app.core.config import settings
 from app.core.orchestration.queue_manager import AsyncQueueManager, QueuePriority
+from app.core.orchestration.admission import AdmissionController
 from app.classification.classification_router import ClassificationRouter
 
 logger = logging.getLogger(__name__)
 
+BUSY_REPLY = "I'm handling a lot of requests right now, please try again in a few minutes."
+RATE_LIMITED_REPLY = "You're sending requests faster than I can keep up with, please wait a minute and try again."
+
+# Discord's message length limit
+MESSAGE_LIMIT = 2000
+# "Processing" messages remembered for streamed edits
+MAX_TRACKED_STREAMS = 1000
+
 class DiscordBot(commands.Bot):
     """Discord bot with LangGraph agent integration"""
 
@@ -26,12 +37,16 @@ class DiscordBot(commands.Bot):
 
         self.queue_manager = queue_manager
         self.classifier = ClassificationRouter()
+        self.admission = AdmissionController(queue_manager)
         self.active_threads: Dict[str, str] = {}
+        # Request id -> "processing" message being edited with the streamed response
+        self.response_streams: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._register_queue_handlers()
 
     def _register_queue_handlers(self):
         """Register handlers for queue messages"""
         self.queue_manager.register_handler("discord_response", self._handle_agent_response)
+        self.queue_manager.register_handler("discord_response_stream", self._handle_agent_response_stream)
 
     async def on_ready(self):
         """Bot ready event"""
@@ -51,13 +66,16 @@ class DiscordBot(commands.Bot):
         if message.interaction_metadata is not None:
             return
 
+        user_id = str(message.author.id)
+        guild_id = str(message.guild.id) if message.guild else None
+
         try:
             triage_result = await self.classifier.should_process_message(
                 message.content,
                 {
                     "channel_id": str(message.channel.id),
-                    "user_id": str(message.author.id),
-                    "guild_id": str(message.guild.id) if message.guild else None
+                    "user_id": user_id,
+                    "guild_id": guild_id
                 }
             )
 
@@ -70,7 +88,22 @@ class DiscordBot(commands.Bot):
     async def _handle_devrel_message(self, message, triage_result: Dict[str, Any]):
         """This now handles both new requests and follow-ups in threads."""
         try:
+            priority_map = {"high": QueuePriority.HIGH,
+                            "medium": QueuePriority.MEDIUM,
+                            "low": QueuePriority.LOW
+                            }
+            priority = priority_map.get(triage_result.get("priority"), QueuePriority.MEDIUM)
             user_id = str(message.author.id)
+            guild_id = str(message.guild.id) if message.guild else None
+
+            # Only requests bound for the agents are charged, so ordinary chat can't drain the buckets
+            if not self.admission.allow(user_id, guild_id):
+                await message.reply(RATE_LIMITED_REPLY)
+                return
+            if await self.admission.should_shed(priority):
+                await message.reply(BUSY_REPLY)
+                return
+
             thread_id = await self._get_or_create_thread(message, user_id)
 
             agent_message = {
@@ -91,18 +124,15 @@ class DiscordBot(commands.Bot):
                     "avatar_url": str(message.author.avatar.url) if message.author.avatar else None
                 }
             }
-            priority_map = {"high": QueuePriority.HIGH,
-                            "medium": QueuePriority.MEDIUM,
-                            "low": QueuePriority.LOW
-                            }
-            priority = priority_map.get(triage_result.get("priority"), QueuePriority.MEDIUM)
             await self.queue_manager.enqueue(agent_message, priority)
 
             # --- "PROCESSING" MESSAGE RESTORED ---
             if thread_id:
                 thread = self.get_channel(int(thread_id))
                 if thread:
-                    await thread.send("I'm processing your request, please hold on...")
+                    processing_message = await thread.send("I'm processing your request, please hold on...")
+                    if settings.discord_stream_responses:
+                        self._track_response_stream(agent_message["id"], processing_message)
             # ------------------------------------
 
         except Exception as e:
@@ -135,11 +165,46 @@ class DiscordBot(commands.Bot):
             response_text = response_data.get("response", "")
             if not thread_id or not response_text:
                 return
+            stream = self.response_streams.pop(response_data.get("original_message_id"), None)
+            if stream and stream["streamed"]:
+                # Finish the streamed message in place and send any overflow
+                await stream["message"].edit(content=response_text[:MESSAGE_LIMIT])
+                response_text = response_text[MESSAGE_LIMIT:]
+                if not response_text:
+                    return
             thread = self.get_channel(int(thread_id))
             if thread:
-                for i in range(0, len(response_text), 2000):
-                    await thread.send(response_text[i:i+2000])
+                for i in range(0, len(response_text), MESSAGE_LIMIT):
+                    await thread.send(response_text[i:i+MESSAGE_LIMIT])
             else:
                 logger.error(f"Thread {thread_id} not found for agent response")
         except Exception as e:
             logger.error(f"Error handling agent response: {str(e)}")
+
+    def _track_response_stream(self, request_id: str, processing_message):
+        self.response_streams[request_id] = {
+            "message": processing_message,
+            "stream_id": None,
+            "sequence": 0,
+            "streamed": False
+        }
+        while len(self.response_streams) > MAX_TRACKED_STREAMS:
+            self.response_streams.popitem(last=False)
+
+    async def _handle_agent_response_stream(self, response_data: Dict[str, Any]):
+        """Edit the "processing" message with the partial response so far"""
+        try:
+            stream = self.response_streams.get(response_data.get("original_message_id"))
+            response_text = response_data.get("response", "")
+            if not stream or not response_text:
+                # Unknown, or the final response already arrived
+                return
+            stream_id = response_data.get("stream_id")
+            sequence = response_data.get("sequence", 0)
+            if stream_id == stream["stream_id"] and sequence <= stream["sequence"]:
+                return
+            # A new stream id is a retried run; it replaces the earlier partial text
+            stream.update(stream_id=stream_id, sequence=sequence, streamed=True)
+            await stream["message"].edit(content=response_text[:MESSAGE_LIMIT])
+        except Exception as e:
+            logger.error(f"Error handling streamed agent response: {str(e)}")
@@ -10,7 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.orchestration.agent_coordinator import AgentCoordinator
-from app.core.orchestration.queue_manager import AsyncQueueManager
+from app.core.orchestration.queue_manager import create_queue_manager
 from app.database.weaviate.client import get_weaviate_client
 from integrations.discord.bot import DiscordBot
 from discord.ext import commands
@@ -32,8 +32,14 @@ class DevRAIApplication:
     def __init__(self):
         """Initializes all services required by the application."""
         self.weaviate_client = None
-        self.queue_manager = AsyncQueueManager()
-        self.agent_coordinator = AgentCoordinator(self.queue_manager)
+        self.queue_manager = create_queue_manager()
+        if settings.run_agents_in_process:
+            self.agent_coordinator = AgentCoordinator(self.queue_manager)
+        elif settings.queue_backend.lower() == "memory":
+            raise ValueError("Agent worker processes need a shared broker; use QUEUE_BACKEND=rabbitmq")
+        else:
+            # Agents are served by agent_worker.py processes
+            self.agent_coordinator = None
         self.discord_bot = DiscordBot(self.queue_manager)
 
     async def start_background_tasks(self):
@@ -43,7 +49,9 @@ class DevRAIApplication:
 
             await self.test_weaviate_connection()
 
-            await self.queue_manager.start(num_workers=3)
+            await self.queue_manager.start()
+            if self.agent_coordinator:
+                await self.agent_coordinator.start()
 
             # --- Load commands inside the async startup function ---
             try:
@@ -85,6 +93,12 @@ class DevRAIApplication:
             logger.info("Queue manager has been stopped.")
         except Exception as e:
             logger.error(f"Error stopping queue manager: {e}", exc_info=True)
+        if self.agent_coordinator:
+            try:
+                await self.agent_coordinator.stop()
+                logger.info("Agent coordinator has been stopped.")
+            except Exception as e:
+                logger.error(f"Error stopping agent coordinator: {e}", exc_info=True)
         logger.info("All background tasks and connections stopped.")
 
 
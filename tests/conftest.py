@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# Backend modules import each other as ``app.*``
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+# Settings require Supabase credentials; unit tests never reach Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
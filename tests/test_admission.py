@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.orchestration import admission
+from app.core.orchestration.admission import AdmissionController, TokenBucket
+from app.core.orchestration.queue_manager import QueuePriority
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeQueueManager:
+    def __init__(self, backlog: int):
+        self.backlog = backlog
+        self.reads = 0
+
+    async def get_task_backlog(self) -> int:
+        self.reads += 1
+        return self.backlog
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "ingress_user_burst", 2)
+    monkeypatch.setattr(settings, "ingress_user_rate_per_minute", 60)
+    monkeypatch.setattr(settings, "ingress_guild_burst", 3)
+    monkeypatch.setattr(settings, "ingress_guild_rate_per_minute", 60)
+    monkeypatch.setattr(settings, "ingress_shed_queue_depth", 10)
+    monkeypatch.setattr(settings, "ingress_backlog_refresh_seconds", 1.0)
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_its_rate(clock):
+    bucket = TokenBucket(capacity=2, rate=0.5)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 1
+    assert not bucket.try_acquire()
+    clock.now += 1
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_never_exceeds_its_capacity(clock):
+    bucket = TokenBucket(capacity=2, rate=1)
+    clock.now += 3600
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_users_are_limited_independently(clock):
+    controller = AdmissionController(FakeQueueManager(0))
+
+    assert controller.allow("alice") and controller.allow("alice")
+    assert not controller.allow("alice")
+    assert controller.allow("bob")
+
+
+def test_guild_bucket_caps_all_of_its_users(clock):
+    controller = AdmissionController(FakeQueueManager(0))
+
+    assert [controller.allow(user, "guild") for user in ("a", "b", "c", "d")] == [True, True, True, False]
+    assert controller.allow("e", "other-guild")
+
+
+def test_only_low_priority_is_shed_over_the_depth_threshold(clock):
+    controller = AdmissionController(FakeQueueManager(10))
+
+    assert asyncio.run(controller.should_shed(QueuePriority.LOW))
+    assert not asyncio.run(controller.should_shed(QueuePriority.MEDIUM))
+    assert not asyncio.run(controller.should_shed(QueuePriority.HIGH))
+
+
+def test_backlog_is_read_at_most_once_per_refresh_interval(clock):
+    queue_manager = FakeQueueManager(0)
+    controller = AdmissionController(queue_manager)
+
+    assert not asyncio.run(controller.should_shed(QueuePriority.LOW))
+    queue_manager.backlog = 50
+    assert not asyncio.run(controller.should_shed(QueuePriority.LOW))
+    clock.now += 1
+    assert asyncio.run(controller.should_shed(QueuePriority.LOW))
+    assert queue_manager.reads == 2
+
+
+def test_guild_rejection_leaves_the_user_bucket_untouched(clock):
+    controller = AdmissionController(FakeQueueManager(0))
+    for user in ("a", "b", "c"):
+        assert controller.allow(user, "guild")
+
+    assert not controller.allow("d", "guild")
+    assert controller._users.bucket("d").tokens == settings.ingress_user_burst
+    assert controller.allow("d", "other-guild") and controller.allow("d", "other-guild")
+
+
+def test_user_rejection_leaves_the_guild_bucket_untouched(clock):
+    controller = AdmissionController(FakeQueueManager(0))
+    assert controller.allow("a", "guild") and controller.allow("a", "guild")
+
+    assert not controller.allow("a", "guild")
+    assert controller._guilds.bucket("guild").tokens == settings.ingress_guild_burst - 2
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.agents.state import AgentState
+from app.core.config import settings
+from app.core.orchestration.agent_coordinator import ERROR_REPLY, AgentCoordinator
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class FakeAgent:
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.runs = 0
+
+    async def run(self, initial_state: AgentState, thread_id: str) -> AgentState:
+        self.runs += 1
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return initial_state.model_copy(update=self.outcome)
+
+
+class FakeQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue(self, message, priority=None):
+        self.enqueued.append(message)
+
+
+@pytest.fixture(autouse=True)
+def no_streaming(monkeypatch):
+    monkeypatch.setattr(settings, "discord_stream_responses", False)
+
+
+def make_coordinator(outcome) -> AgentCoordinator:
+    # Skip __init__: it builds the real agent and registers queue handlers
+    coordinator = AgentCoordinator.__new__(AgentCoordinator)
+    coordinator.queue_manager = FakeQueue()
+    coordinator.devrel_agent = FakeAgent(outcome)
+    coordinator._summarization_tasks = {}
+    return coordinator
+
+
+def request() -> dict:
+    return {"id": "discord_1", "type": "devrel_request", "user_id": "u1", "memory_thread_id": "u1",
+            "platform": "discord", "thread_id": "t1", "content": "hello"}
+
+
+def replies(coordinator: AgentCoordinator) -> list:
+    return [message["response"] for message in coordinator.queue_manager.enqueued]
+
+
+def test_transient_llm_errors_are_raised_for_the_queue_to_retry():
+    coordinator = make_coordinator(ApiError(503))
+
+    with pytest.raises(ApiError):
+        asyncio.run(coordinator._handle_devrel_request(request()))
+
+    assert replies(coordinator) == []
+
+
+def test_other_exceptions_get_the_error_reply_without_a_retry():
+    coordinator = make_coordinator(ValueError("supervisor bug"))
+
+    asyncio.run(coordinator._handle_devrel_request(request()))
+
+    assert replies(coordinator) == [ERROR_REPLY]
+    assert coordinator.devrel_agent.runs == 1
+
+
+def test_runs_ending_in_errors_without_a_response_get_the_error_reply():
+    coordinator = make_coordinator({"errors": ["validation failed"], "final_response": None})
+
+    asyncio.run(coordinator._handle_devrel_request(request()))
+
+    assert replies(coordinator) == [ERROR_REPLY]
+
+
+def test_successful_runs_send_their_response():
+    coordinator = make_coordinator({"final_response": "Welcome!"})
+
+    asyncio.run(coordinator._handle_devrel_request(request()))
+
+    assert replies(coordinator) == ["Welcome!"]
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.agents.state import advance_watermark, evict_summarized, window_messages
+from app.core.config import settings
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+def message(n: int) -> dict:
+    return {"role": "user", "content": f"message {n}", "timestamp": (START + timedelta(minutes=n)).isoformat()}
+
+
+def contents(messages) -> list:
+    return [message["content"] for message in messages]
+
+
+@pytest.fixture(autouse=True)
+def window_of_three(monkeypatch):
+    monkeypatch.setattr(settings, "agent_message_window", 3)
+
+
+def test_messages_are_appended_without_evicting_unsummarized_ones():
+    messages = window_messages([message(n) for n in range(3)], [message(3), message(4)])
+
+    assert contents(messages) == [f"message {n}" for n in range(5)]
+
+
+def test_summary_evicts_covered_messages_down_to_the_window():
+    existing = [message(n) for n in range(6)]
+
+    messages = window_messages(existing, [evict_summarized(START + timedelta(minutes=4))])
+
+    assert contents(messages) == ["message 3", "message 4", "message 5"]
+
+
+def test_messages_newer_than_the_watermark_are_never_evicted():
+    existing = [message(n) for n in range(6)]
+
+    messages = window_messages(existing, [evict_summarized(START + timedelta(minutes=1))])
+
+    assert contents(messages) == [f"message {n}" for n in range(2, 6)]
+
+
+def test_messages_without_timestamp_count_as_summarized():
+    existing = [{"role": "user", "content": "legacy"}] + [message(n) for n in range(3)]
+
+    messages = window_messages(existing, [evict_summarized(datetime.min)])
+
+    assert contents(messages) == ["message 0", "message 1", "message 2"]
+
+
+def test_window_of_zero_keeps_everything(monkeypatch):
+    monkeypatch.setattr(settings, "agent_message_window", 0)
+    existing = [message(n) for n in range(6)]
+
+    assert window_messages(existing, [evict_summarized(START + timedelta(hours=1))]) == existing
+
+
+def test_watermark_only_moves_forward():
+    earlier, later = START, START + timedelta(minutes=5)
+
+    assert advance_watermark(earlier, later) == later
+    assert advance_watermark(later, earlier) == later
+
+
+def test_watermark_ignores_missing_values():
+    assert advance_watermark(None, START) == START
+    assert advance_watermark(START, None) == START
+    assert advance_watermark(None, None) is None
@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from app.agents.checkpointer import BoundedCheckpointSaver
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def sqlite_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "agent_checkpoint_path", str(tmp_path / "checkpoints.sqlite"))
+    monkeypatch.setattr(settings, "run_agents_in_process", True)
+
+
+def thread_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+async def put(saver: BoundedCheckpointSaver, thread_id: str, count: int) -> dict:
+    """Write a checkpoint holding ``count`` as the thread's newest"""
+    latest = await saver.aget_tuple(thread_config(thread_id))
+    parent_config = latest.config if latest else thread_config(thread_id)
+    previous = latest.checkpoint["channel_versions"].get("count") if latest else None
+    checkpoint = empty_checkpoint()
+    version = saver.get_next_version(previous, None)
+    checkpoint["channel_values"] = {"count": count}
+    checkpoint["channel_versions"] = {"count": version}
+    return await saver.aput(parent_config, checkpoint, {"source": "loop", "step": count}, {"count": version})
+
+
+async def latest_count(saver: BoundedCheckpointSaver, thread_id: str):
+    checkpoint_tuple = await saver.aget_tuple(thread_config(thread_id))
+    return checkpoint_tuple.checkpoint["channel_values"]["count"] if checkpoint_tuple else None
+
+
+async def stored_counts(saver: BoundedCheckpointSaver, thread_id: str) -> list:
+    return [
+        checkpoint_tuple.checkpoint["channel_values"]["count"]
+        async for checkpoint_tuple in saver.alist(thread_config(thread_id))
+    ]
+
+
+def test_checkpoints_are_written_through_to_sqlite():
+    async def scenario():
+        writer = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        await put(writer, "a", 1)
+        await put(writer, "a", 2)
+        await writer.aclose()
+
+        reader = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        try:
+            return await latest_count(reader, "a")
+        finally:
+            await reader.aclose()
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_cache_keeps_the_most_recently_used_threads():
+    async def scenario():
+        saver = BoundedCheckpointSaver("sqlite", cache_size=2, history=5)
+        try:
+            for thread_id in ("a", "b", "c"):
+                await put(saver, thread_id, 1)
+            after_writes = list(saver._cache)
+
+            reads = []
+            durable_aget_tuple = saver._durable.aget_tuple
+
+            async def counting_aget_tuple(config):
+                reads.append(config["configurable"]["thread_id"])
+                return await durable_aget_tuple(config)
+
+            saver._durable.aget_tuple = counting_aget_tuple
+            assert await latest_count(saver, "c") == 1
+            assert await latest_count(saver, "a") == 1
+            return after_writes, reads, list(saver._cache)
+        finally:
+            await saver.aclose()
+
+    after_writes, reads, after_reads = asyncio.run(scenario())
+
+    assert after_writes == [("b", ""), ("c", "")]
+    # "c" is served from the cache; evicted "a" is read back and evicts "b"
+    assert reads == ["a"]
+    assert after_reads == [("c", ""), ("a", "")]
+
+
+def test_pending_writes_invalidate_the_cached_checkpoint():
+    async def scenario():
+        saver = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        try:
+            config = await put(saver, "a", 1)
+            await saver.aput_writes(config, [("count", 2)], "task-1")
+            cached = ("a", "") in saver._cache
+            checkpoint_tuple = await saver.aget_tuple(thread_config("a"))
+            return cached, checkpoint_tuple.pending_writes
+        finally:
+            await saver.aclose()
+
+    cached, pending_writes = asyncio.run(scenario())
+
+    assert not cached
+    assert pending_writes == [("task-1", "count", 2)]
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "memory"])
+def test_history_is_pruned_to_the_newest_checkpoints(backend):
+    async def scenario():
+        saver = BoundedCheckpointSaver(backend, cache_size=8, history=3)
+        try:
+            counts = []
+            for count in range(1, 10):
+                await put(saver, "a", count)
+                counts.append(len(await stored_counts(saver, "a")))
+            await put(saver, "b", 1)
+            return counts, await stored_counts(saver, "a"), await latest_count(saver, "a"), await stored_counts(
+                saver, "b"
+            )
+        finally:
+            await saver.aclose()
+
+    counts, stored, latest, other = asyncio.run(scenario())
+
+    # Rebuilt every 3 writes, so a thread never holds more than twice its history
+    assert max(counts) <= 6
+    assert counts[-1] == 3
+    assert stored == [9, 8, 7]
+    assert latest == 9
+    assert other == [1]
+
+
+def test_pruning_keeps_pending_writes_and_parents_of_kept_checkpoints():
+    async def scenario():
+        saver = BoundedCheckpointSaver("sqlite", cache_size=8, history=2)
+        try:
+            for count in range(1, 4):
+                config = await put(saver, "a", count)
+            await saver.aput_writes(config, [("count", 30)], "task-3")
+            await put(saver, "a", 4)
+            kept = [checkpoint_tuple async for checkpoint_tuple in saver.alist(thread_config("a"))]
+            return kept, config
+        finally:
+            await saver.aclose()
+
+    kept, third_config = asyncio.run(scenario())
+
+    assert [checkpoint_tuple.checkpoint["channel_values"]["count"] for checkpoint_tuple in kept] == [4, 3]
+    assert kept[1].pending_writes == [("task-3", "count", 30)]
+    assert kept[0].parent_config["configurable"]["checkpoint_id"] == third_config["configurable"]["checkpoint_id"]
+
+
+def test_processes_sharing_sqlite_see_each_others_writes(monkeypatch):
+    monkeypatch.setattr(settings, "run_agents_in_process", False)
+
+    async def scenario():
+        first = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        second = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        try:
+            await put(first, "a", 1)
+            assert await latest_count(first, "a") == 1
+            await put(second, "a", 2)
+            return await latest_count(first, "a"), first._cache
+        finally:
+            await first.aclose()
+            await second.aclose()
+
+    latest, cache = asyncio.run(scenario())
+
+    assert latest == 2
+    assert not cache
+
+
+def test_thread_ids_are_listed_once_each():
+    async def scenario():
+        saver = BoundedCheckpointSaver("sqlite", cache_size=8, history=5)
+        try:
+            for thread_id, count in (("a", 1), ("b", 1), ("a", 2)):
+                await put(saver, thread_id, count)
+            listed = sorted(await saver.alist_thread_ids())
+            await saver.adelete_thread("a")
+            return listed, await saver.alist_thread_ids()
+        finally:
+            await saver.aclose()
+
+    listed, after_delete = asyncio.run(scenario())
+
+    assert listed == ["a", "b"]
+    assert after_delete == ["b"]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.core.orchestration import dedup
+from app.core.orchestration.dedup import ClaimStatus, DedupStore, InMemoryDedupStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(dedup.time, "monotonic", lambda: now[0])
+    return now
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_dedup_store_is_abstract():
+    with pytest.raises(TypeError):
+        DedupStore()
+
+
+def test_completed_id_is_suppressed_for_the_window(clock):
+    store = InMemoryDedupStore(window_seconds=60, claim_timeout_seconds=10, max_entries=100)
+
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+    run(store.complete("m1"))
+    assert run(store.claim("m1")) == ClaimStatus.COMPLETED
+    clock[0] += 61
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+
+
+def test_in_flight_claim_expires_after_the_claim_timeout(clock):
+    store = InMemoryDedupStore(window_seconds=60, claim_timeout_seconds=10, max_entries=100)
+
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+    assert run(store.claim("m1")) == ClaimStatus.IN_FLIGHT
+    clock[0] += 11
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+
+
+def test_released_id_can_be_claimed_again(clock):
+    store = InMemoryDedupStore(window_seconds=60, claim_timeout_seconds=10, max_entries=100)
+
+    run(store.claim("m1"))
+    run(store.release("m1"))
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(clock):
+    store = InMemoryDedupStore(window_seconds=60, claim_timeout_seconds=10, max_entries=2)
+
+    for message_id in ("m1", "m2", "m3"):
+        run(store.claim(message_id))
+        run(store.complete(message_id))
+
+    assert run(store.claim("m1")) == ClaimStatus.CLAIMED
+    assert run(store.claim("m3")) == ClaimStatus.COMPLETED
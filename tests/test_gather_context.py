@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.agents.state import AgentState
+from app.agents.devrel.nodes import gather_context
+
+
+@pytest.fixture(autouse=True)
+def offline_database(monkeypatch):
+    async def ensure_user_exists(**kwargs):
+        return "user-uuid"
+
+    async def get_conversation_context(user_uuid):
+        return None
+
+    monkeypatch.setattr(gather_context, "ensure_user_exists", ensure_user_exists)
+    monkeypatch.setattr(gather_context, "get_conversation_context", get_conversation_context)
+
+
+def make_state(**overrides) -> AgentState:
+    fields = {
+        "session_id": "session",
+        "user_id": "user",
+        "platform": "slack",
+        "context": {"original_message": "How do I contribute?", "message_id": "discord_1"},
+    }
+    fields.update(overrides)
+    return AgentState(**fields)
+
+
+def test_new_message_is_tagged_with_its_queue_message_id():
+    result = asyncio.run(gather_context.gather_context_node(make_state()))
+
+    [message] = result["messages"]
+    assert message["id"] == "discord_1"
+    assert message["content"] == "How do I contribute?"
+
+
+def test_retried_request_does_not_add_its_message_twice():
+    recorded = {"role": "user", "content": "How do I contribute?", "id": "discord_1"}
+
+    result = asyncio.run(gather_context.gather_context_node(make_state(messages=[recorded])))
+
+    assert result["messages"] == []
+    assert result["context"]["conversation_context"] == 1
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.llm import cache as llm_cache
+from app.core.llm import cached_invoke
+from app.core.llm.cache import LLMResponseCache
+
+
+class FakeLLM:
+    model = "fake"
+    temperature = 0.0
+
+    def __init__(self, reply: str = "answer", delay: float = 0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return type("Response", (), {"content": self.reply})()
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    monkeypatch.setattr(settings, "llm_cache_path", "")
+    monkeypatch.setattr(llm_cache, "_cache", None)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=8)
+
+    async def scenario():
+        await cache.set("k", "v")
+        clock.now += 59
+        fresh = await cache.get("k")
+        clock.now += 2
+        return fresh, await cache.get("k")
+
+    fresh, expired = asyncio.run(scenario())
+
+    assert fresh == ("v", "memory")
+    assert expired == (None, "miss")
+    assert "k" not in cache._entries
+
+
+def test_least_recently_used_entries_are_evicted_past_the_bound():
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.get("a")
+        await cache.set("c", "3")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [("1", "memory"), (None, "miss"), ("3", "memory")]
+
+
+def test_sqlite_tier_serves_entries_to_a_new_process(tmp_path):
+    path = str(tmp_path / "cache" / "llm.sqlite")
+
+    async def scenario():
+        await LLMResponseCache(ttl_seconds=60, max_entries=8, path=path).set("k", "v")
+        reader = LLMResponseCache(ttl_seconds=60, max_entries=8, path=path)
+        return await reader.get("k"), await reader.get("k")
+
+    from_disk, from_memory = asyncio.run(scenario())
+
+    assert from_disk == ("v", "disk")
+    assert from_memory == ("v", "memory")
+
+
+def test_sqlite_tier_skips_expired_entries(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite")
+
+    async def scenario():
+        await LLMResponseCache(ttl_seconds=60, max_entries=8, path=path).set("k", "v")
+        clock.now += 61
+        return await LLMResponseCache(ttl_seconds=60, max_entries=8, path=path).get("k")
+
+    assert asyncio.run(scenario()) == (None, "miss")
+
+
+def test_concurrent_misses_share_one_call():
+    llm = FakeLLM(delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(cached_invoke(llm, "Classify  THIS", "test") for _ in range(5)))
+
+    replies = asyncio.run(scenario())
+
+    assert replies == ["answer"] * 5
+    assert llm.calls == 1
+    assert not llm_cache.get_llm_cache()._inflight
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    llm = FakeLLM(delay=0.02)
+
+    async def scenario():
+        first = asyncio.ensure_future(cached_invoke(llm, "prompt", "test"))
+        second = asyncio.ensure_future(cached_invoke(llm, "prompt", "test"))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("answer", True)
+    assert llm.calls == 1
+
+
+def test_repeats_are_served_from_the_cache_by_normalized_prompt():
+    llm = FakeLLM()
+
+    async def scenario():
+        await cached_invoke(llm, "Classify  this", "test")
+        return await cached_invoke(llm, " classify this\n", "test")
+
+    assert asyncio.run(scenario()) == "answer"
+    assert llm.calls == 1
+
+
+def test_responses_rejected_by_cacheable_are_returned_but_not_stored():
+    llm = FakeLLM(reply="not json")
+
+    async def scenario():
+        return [await cached_invoke(llm, "prompt", "test", cacheable=lambda text: text.startswith("{"))
+                for _ in range(2)]
+
+    replies = asyncio.run(scenario())
+
+    assert replies == ["not json", "not json"]
+    assert llm.calls == 2
+    assert not llm_cache.get_llm_cache()._entries
+
+
+def test_disabled_cache_always_calls_the_model(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    llm = FakeLLM()
+
+    async def scenario():
+        for _ in range(2):
+            await cached_invoke(llm, "prompt", "test")
+
+    asyncio.run(scenario())
+
+    assert llm.calls == 2
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.llm import SharedLLMClient, is_transient_llm_error, llm_stats
+from app.core.llm import registry as llm_registry
+from app.core.llm.registry import LLM_IN_FLIGHT, LLM_QUEUED
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.mark.parametrize("error", [
+    ApiError(429), ApiError(500), ApiError(503), asyncio.TimeoutError(), ConnectionResetError()
+])
+def test_rate_limits_and_server_errors_are_transient(error):
+    assert is_transient_llm_error(error)
+
+
+@pytest.mark.parametrize("error", [ApiError(400), ApiError(403), ValueError("bad prompt"), KeyError("x")])
+def test_bad_requests_are_not_transient(error):
+    assert not is_transient_llm_error(error)
+
+
+def test_gemini_api_errors_are_classified_by_status():
+    exceptions = pytest.importorskip("google.api_core.exceptions")
+
+    assert is_transient_llm_error(exceptions.ResourceExhausted("quota exceeded"))
+    assert is_transient_llm_error(exceptions.ServiceUnavailable("overloaded"))
+    assert not is_transient_llm_error(exceptions.InvalidArgument("bad request"))
+
+
+class FakeChatModel:
+    """Records how many calls overlap, per model and overall"""
+
+    model_name = "fake"
+
+    def __init__(self, model: str, tracker: dict):
+        self.model = model
+        self.tracker = tracker
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        tracker = self.tracker
+        tracker["running"][self.model] = tracker["running"].get(self.model, 0) + 1
+        total = sum(tracker["running"].values())
+        tracker["peak_total"] = max(tracker["peak_total"], total)
+        tracker["peak"][self.model] = max(tracker["peak"].get(self.model, 0), tracker["running"][self.model])
+        tracker["stats"].append(llm_stats().get(self.model))
+        await asyncio.sleep(0.01)
+        tracker["running"][self.model] -= 1
+        return messages
+
+    def invoke(self, messages, config=None, **kwargs):
+        return messages
+
+    def with_structured_output(self, schema):
+        return self
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_concurrency", 3)
+    monkeypatch.setattr(settings, "llm_model_max_concurrency", 2)
+    monkeypatch.setattr(settings, "llm_model_concurrency", {})
+    # Semaphores are created on first use; start each test with fresh ones
+    monkeypatch.setattr(llm_registry, "_global_slots", None)
+    monkeypatch.setattr(llm_registry, "_model_slots", {})
+    monkeypatch.setattr(llm_registry, "_in_flight", {})
+    monkeypatch.setattr(llm_registry, "_queued", {})
+    return {"running": {}, "peak": {}, "peak_total": 0, "stats": []}
+
+
+def shared_client(model: str, tracker: dict) -> SharedLLMClient:
+    # Skip __init__, which builds a real Gemini client
+    client = SharedLLMClient.__new__(SharedLLMClient)
+    client.model = model
+    client.temperature = 0.0
+    client.client = FakeChatModel(model, tracker)
+    return client
+
+
+def gauge_value(gauge, model: str) -> float:
+    return next(value for _, labels, value in gauge.samples() if labels["model"] == model)
+
+
+def test_calls_beyond_the_model_cap_wait_for_a_slot(tracker):
+    client = shared_client("model-a", tracker)
+
+    async def scenario():
+        return await asyncio.gather(*(client.ainvoke(n) for n in range(6)))
+
+    assert asyncio.run(scenario()) == list(range(6))
+    assert tracker["peak"]["model-a"] == 2
+    # The first two run before the rest arrive, which then queue behind them
+    assert max(stats["queued"] for stats in tracker["stats"]) == 3
+    assert max(stats["in_flight"] for stats in tracker["stats"]) == 2
+    assert llm_stats()["model-a"] == {"in_flight": 0, "queued": 0}
+    assert gauge_value(LLM_IN_FLIGHT, "model-a") == 0
+    assert gauge_value(LLM_QUEUED, "model-a") == 0
+
+
+def test_the_global_cap_spans_models(tracker):
+    clients = [shared_client("model-a", tracker), shared_client("model-b", tracker)]
+
+    async def scenario():
+        await asyncio.gather(*(client.ainvoke(n) for client in clients for n in range(4)))
+
+    asyncio.run(scenario())
+
+    assert tracker["peak_total"] == 3
+    assert max(tracker["peak"].values()) == 2
+
+
+def test_batches_queue_like_separate_calls(tracker):
+    client = shared_client("model-a", tracker)
+
+    assert asyncio.run(client.abatch(list(range(5)))) == list(range(5))
+    assert tracker["peak"]["model-a"] == 2
+
+
+def test_methods_that_would_bypass_the_caps_are_refused(tracker):
+    client = shared_client("model-a", tracker)
+
+    with pytest.raises(AttributeError, match="ainvoke, abatch or astream"):
+        client.invoke("hi")
+    with pytest.raises(AttributeError):
+        client.with_structured_output(dict)
+    assert client.model_name == "fake"
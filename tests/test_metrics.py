@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import MetricsRegistry, registry, start_metrics_server
+
+
+def test_renders_counters_and_gauges_with_escaped_labels():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests served", ["path"])
+    workers = registry.gauge("workers", "Running workers")
+    requests.inc(path="/a")
+    requests.inc(2, path='say "hi"\n')
+    workers.set(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests served",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a"} 1',
+        'requests_total{path="say \\"hi\\"\\n"} 2',
+        "# HELP workers Running workers",
+        "# TYPE workers gauge",
+        "workers 3",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ["op"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value, op="read")
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{op="read",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{op="read",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{op="read"} 6.05' in lines
+    assert 'latency_seconds_count{op="read"} 4' in lines
+
+
+def test_registering_a_name_twice_returns_the_same_metric():
+    registry = MetricsRegistry()
+
+    assert registry.counter("events_total", "Events") is registry.counter("events_total", "Events")
+    with pytest.raises(ValueError):
+        registry.gauge("events_total", "Events")
+
+
+def test_labels_must_match_the_declared_names():
+    counter = MetricsRegistry().counter("events_total", "Events", ["type"])
+
+    with pytest.raises(ValueError):
+        counter.inc(kind="x")
+
+
+async def _fetch(port: int, path: str) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def test_metrics_server_serves_the_registry_after_collecting():
+    collected = []
+
+    async def collect():
+        collected.append(True)
+        registry.gauge("test_worker_metrics_server", "Set by the collect hook").set(7)
+
+    async def scenario():
+        server = await start_metrics_server(0, host="127.0.0.1", collect=collect)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await _fetch(port, "/metrics"), await _fetch(port, "/other")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    metrics, missing = asyncio.run(scenario())
+
+    assert metrics.startswith(b"HTTP/1.1 200 OK")
+    assert b"text/plain; version=0.0.4" in metrics
+    assert b"\ntest_worker_metrics_server 7\n" in metrics
+    assert collected == [True]
+    assert missing.startswith(b"HTTP/1.1 404")
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from app.agents.prompt_budget import (
+    MAX_LIST_ITEMS, TRUNCATION_MARKER, count_tokens, fit_messages, history_section, json_section, text_section
+)
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def small_budgets(monkeypatch):
+    monkeypatch.setattr(settings, "prompt_section_budgets", {
+        "latest_message": 20, "tool_results": 400, "conversation_history": 30
+    })
+
+
+def test_text_within_budget_is_unchanged():
+    assert text_section("How do I run the tests?", "latest_message") == "How do I run the tests?"
+    assert text_section(None, "latest_message", default="none") == "none"
+
+
+def test_long_text_is_cut_to_the_budget_keeping_its_start():
+    text = " ".join(f"word{n}" for n in range(200))
+
+    section = text_section(text, "latest_message")
+
+    assert section.startswith("word0 ")
+    assert section.endswith(TRUNCATION_MARKER)
+    assert count_tokens(section) <= 20
+
+
+def test_keep_tail_keeps_the_end_of_the_text():
+    text = " ".join(f"word{n}" for n in range(200))
+
+    section = text_section(text, "latest_message", keep_tail=True)
+
+    assert section.startswith(TRUNCATION_MARKER)
+    assert section.endswith("word199")
+
+
+def test_json_sections_compact_long_lists():
+    section = json_section({"issues": list(range(25))}, "tool_results")
+
+    assert json.loads(section) == {"issues": list(range(MAX_LIST_ITEMS)) + [f"... {25 - MAX_LIST_ITEMS} more"]}
+
+
+def test_history_keeps_the_newest_whole_messages_that_fit():
+    messages = [{"role": "user", "content": f"question number {n} about the project"} for n in range(10)]
+
+    section = history_section(messages, "conversation_history")
+    lines = section.splitlines()
+
+    assert lines[0].startswith("[Showing last ")
+    assert lines[-1] == "user: question number 9 about the project"
+    assert all(TRUNCATION_MARKER not in line for line in lines)
+    assert count_tokens("\n".join(lines[1:])) <= 30
+
+
+def test_history_cuts_a_single_oversized_message_instead_of_dropping_it():
+    messages = [{"role": "user", "content": "word " * 200}]
+
+    section = history_section(messages, "conversation_history")
+
+    assert section.startswith("user: word")
+    assert section.endswith(TRUNCATION_MARKER)
+
+
+def test_empty_history_uses_the_default():
+    assert history_section([], "conversation_history") == "No previous conversation"
+
+
+def test_fit_messages_takes_whole_messages_from_either_end():
+    messages = [{"role": "user", "content": f"question number {n} about the project"} for n in range(10)]
+
+    newest = fit_messages(messages, "conversation_history")
+    oldest = fit_messages(messages, "conversation_history", oldest_first=True)
+
+    assert 0 < len(newest) < len(messages)
+    assert newest == messages[-len(newest):]
+    assert oldest == messages[:len(oldest)]
+
+
+def test_fit_messages_keeps_an_oversized_first_message():
+    messages = [{"role": "user", "content": "word " * 200}, {"role": "user", "content": "short"}]
+
+    assert fit_messages(messages, "conversation_history", oldest_first=True) == messages[:1]
+
+
+def test_oldest_first_history_shows_the_earliest_messages():
+    messages = [{"role": "user", "content": f"question number {n} about the project"} for n in range(10)]
+
+    lines = history_section(messages, "conversation_history", oldest_first=True).splitlines()
+
+    assert lines[0].startswith("[Showing first ")
+    assert lines[1] == "user: question number 0 about the project"
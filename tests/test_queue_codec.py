@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from app.core.orchestration.codec import JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE, decode_payload, get_codec
+
+ENVELOPE = {
+    "id": "msg_1",
+    "priority": "high",
+    "enqueued_at": 1700000000.25,
+    "data": {"type": "devrel_request", "content": "héllo 👋", "context": {"tags": ["a", "b"], "count": 2}},
+}
+
+
+def test_json_round_trip():
+    codec = get_codec("json")
+
+    assert codec.content_type == JSON_CONTENT_TYPE
+    assert decode_payload(codec.encode(ENVELOPE), codec.content_type) == ENVELOPE
+
+
+def test_messages_without_content_type_are_legacy_json():
+    assert decode_payload(json.dumps(ENVELOPE).encode(), None) == ENVELOPE
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("ormsgpack")
+    codec = get_codec("msgpack")
+
+    assert codec.content_type == MSGPACK_CONTENT_TYPE
+    assert decode_payload(codec.encode(ENVELOPE), codec.content_type) == ENVELOPE
+
+
+def test_unknown_codec_falls_back_to_json():
+    assert get_codec("protobuf").content_type == JSON_CONTENT_TYPE
+
+
+def test_unsupported_content_type_is_rejected():
+    with pytest.raises(ValueError):
+        decode_payload(b"...", "application/x-protobuf")
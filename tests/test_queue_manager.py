@@ -0,0 +1,246 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.orchestration.queue_manager import InMemoryQueueManager, QueuePriority
+
+
+@pytest.fixture(autouse=True)
+def fixed_pool(monkeypatch):
+    monkeypatch.setattr(settings, "queue_autoscale", False)
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.005)
+
+
+async def idle(manager: InMemoryQueueManager):
+    await wait_until(lambda: manager._pending == 0 and manager.in_flight == 0)
+
+
+def test_conversation_runs_in_arrival_order_while_others_run_in_parallel():
+    events = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+
+        async def handler(data):
+            events.append(("start", data["n"]))
+            await asyncio.sleep(data.get("sleep", 0))
+            events.append(("end", data["n"]))
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=3)
+        await manager.enqueue({"type": "work", "n": 1, "memory_thread_id": "a", "sleep": 0.05})
+        await manager.enqueue({"type": "work", "n": 2, "memory_thread_id": "a"})
+        await manager.enqueue({"type": "work", "n": 3, "memory_thread_id": "b"})
+        await wait_until(lambda: len(events) == 6)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+    assert events.index(("end", 1)) < events.index(("start", 2))
+    assert events.index(("start", 3)) < events.index(("end", 1))
+
+
+def test_lane_keeps_order_with_every_worker_busy():
+    handled = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+        release = asyncio.Event()
+
+        async def handler(data):
+            if data["n"] == 0:
+                await release.wait()
+            handled.append(data["n"])
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=2)
+        await manager.enqueue({"type": "work", "n": 0, "memory_thread_id": "other"})
+        for n in range(1, 6):
+            await manager.enqueue({"type": "work", "n": n, "memory_thread_id": "a"})
+        await wait_until(lambda: handled == [1, 2, 3, 4, 5])
+        assert not manager.has_active_lane("a")
+        release.set()
+        await idle(manager)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+    assert handled == [1, 2, 3, 4, 5, 0]
+
+
+def test_retiring_an_idle_worker_does_not_lose_ready_work():
+    handled = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+
+        async def handler(data):
+            handled.append(data["n"])
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=2)
+        idle_worker = next(name for name in manager.worker_tasks if name not in manager._busy_workers)
+        await manager.enqueue({"type": "work", "n": 1, "memory_thread_id": "a"})
+        # Cancelled while the ready queue is waking it up
+        manager.worker_tasks[idle_worker].cancel()
+        await wait_until(lambda: handled == [1])
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_free_worker_takes_highest_priority_first():
+    handled = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+        release = asyncio.Event()
+
+        async def handler(data):
+            if data["n"] == "blocker":
+                await release.wait()
+            handled.append(data["n"])
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=1)
+        await manager.enqueue({"type": "work", "n": "blocker"}, QueuePriority.HIGH)
+        await wait_until(lambda: manager.in_flight == 1)
+        await manager.enqueue({"type": "work", "n": "low"}, QueuePriority.LOW)
+        await manager.enqueue({"type": "work", "n": "medium"}, QueuePriority.MEDIUM)
+        await manager.enqueue({"type": "work", "n": "high"}, QueuePriority.HIGH)
+        release.set()
+        await idle(manager)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+    assert handled == ["blocker", "high", "medium", "low"]
+
+
+def test_priority_does_not_reorder_a_conversation():
+    handled = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+        release = asyncio.Event()
+
+        async def handler(data):
+            if data["n"] == "blocker":
+                await release.wait()
+            handled.append(data["n"])
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=1)
+        await manager.enqueue({"type": "work", "n": "blocker"})
+        await wait_until(lambda: manager.in_flight == 1)
+        await manager.enqueue({"type": "work", "n": "first", "memory_thread_id": "a"}, QueuePriority.LOW)
+        await manager.enqueue({"type": "work", "n": "second", "memory_thread_id": "a"}, QueuePriority.HIGH)
+        release.set()
+        await idle(manager)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+    assert handled == ["blocker", "first", "second"]
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "queue_max_attempts", 3)
+    monkeypatch.setattr(InMemoryQueueManager, "_retry_delay", staticmethod(lambda attempts: 0.01))
+
+
+def test_failed_handler_is_retried_until_it_succeeds(fast_retries):
+    attempts = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+
+        async def handler(data):
+            attempts.append(data["n"])
+            if len(attempts) < 3:
+                raise RuntimeError("Gemini returned 503")
+
+        manager.register_handler("work", handler)
+        await manager.start(num_workers=1)
+        await manager.enqueue({"type": "work", "n": 1})
+        await wait_until(lambda: len(attempts) == 3)
+        await idle(manager)
+        assert await manager.get_dead_letters() == []
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_exhausted_retries_are_dead_lettered_and_can_be_replayed(fast_retries):
+    dead_lettered = []
+    calls = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+
+        async def handler(data):
+            calls.append(data["n"])
+            raise RuntimeError("boom")
+
+        manager.register_handler("work", handler)
+        manager.register_dead_letter_handler("work", dead_lettered.append)
+        await manager.start(num_workers=1)
+        await manager.enqueue({"type": "work", "id": "msg_dlq", "n": 1})
+        await wait_until(lambda: dead_lettered)
+
+        [item] = await manager.get_dead_letters()
+        assert item["id"] == "msg_dlq"
+        assert item["attempts"] == 3
+        assert item["last_error"] == "boom"
+        assert calls == [1, 1, 1]
+
+        assert await manager.replay_dead_letters(["msg_dlq"]) == 1
+        await wait_until(lambda: len(calls) == 6)
+        await wait_until(lambda: len(dead_lettered) == 2)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_partial_response_is_delivered_while_the_run_is_still_going():
+    events = []
+
+    async def scenario():
+        manager = InMemoryQueueManager()
+        partial_delivered = asyncio.Event()
+
+        async def devrel_request(data):
+            events.append("run started")
+            await manager.enqueue({
+                "type": "discord_response_stream",
+                "memory_thread_id": data["memory_thread_id"],
+                "content": "partial"
+            }, QueuePriority.HIGH)
+            # The run only finishes once its partial reached Discord
+            await asyncio.wait_for(partial_delivered.wait(), timeout=2)
+            events.append("run finished")
+
+        async def discord_response_stream(data):
+            events.append("partial delivered")
+            partial_delivered.set()
+
+        manager.register_handler("devrel_request", devrel_request)
+        manager.register_handler("discord_response_stream", discord_response_stream)
+        await manager.start(num_workers=2)
+        await manager.enqueue({"type": "devrel_request", "memory_thread_id": "user-1"})
+        await wait_until(lambda: "run finished" in events, timeout=3)
+        assert manager.has_active_lane("user-1") is False
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+    assert events == ["run started", "partial delivered", "run finished"]
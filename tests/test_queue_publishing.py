@@ -0,0 +1,198 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.orchestration.codec import decode_payload
+from app.core.orchestration.queue_manager import (
+    DEAD_LETTER_QUEUE, DEFAULT_QUEUE_GROUP, DELAY_QUEUE_EXPIRY_MARGIN_MS, MAX_PRIORITY_LEVEL, NATIVE_PRIORITY_QUEUE,
+    PRIORITY_LEVELS, AsyncQueueManager, QueuePriority
+)
+
+
+def envelope_id(message) -> str:
+    try:
+        return decode_payload(message.body, message.content_type)["id"]
+    except ValueError:
+        return message.message_id
+
+
+class FakeExchange:
+    def __init__(self, broker: "FakeBroker"):
+        self.broker = broker
+
+    async def publish(self, message, routing_key: str):
+        if envelope_id(message) in self.broker.nacked_ids:
+            raise RuntimeError("publish not confirmed")
+        self.broker.published.append((routing_key, message))
+        self.broker.queues.setdefault(routing_key, []).append(message)
+
+
+class FakeBroker:
+    """Records declarations and publishes on the default exchange, like a RabbitMQ channel"""
+
+    def __init__(self):
+        self.declared = {}
+        self.published = []
+        self.queues = {}
+        # Publishes of these envelope ids are nacked by the broker
+        self.nacked_ids = set()
+        self.default_exchange = FakeExchange(self)
+
+    async def declare_queue(self, name: str, durable: bool = False, arguments=None, passive: bool = False):
+        self.declared[name] = arguments or {}
+        return name
+
+    def expire(self, queue_name: str):
+        """Dead-letter every message in ``queue_name`` as its TTL running out would"""
+        arguments = self.declared[queue_name]
+        assert arguments.get("x-dead-letter-exchange") == ""
+        target = arguments["x-dead-letter-routing-key"]
+        for message in self.queues.pop(queue_name, []):
+            self.queues.setdefault(target, []).append(message)
+
+
+@pytest.fixture(autouse=True)
+def single_shard(monkeypatch):
+    monkeypatch.setattr(settings, "queue_shards", 1)
+    monkeypatch.setattr(settings, "queue_native_priority", False)
+
+
+def manager_with_broker() -> AsyncQueueManager:
+    manager = AsyncQueueManager()
+    manager.channel = FakeBroker()
+    return manager
+
+
+def test_native_priority_declares_one_queue_with_max_priority(monkeypatch):
+    monkeypatch.setattr(settings, "queue_native_priority", True)
+    manager = manager_with_broker()
+
+    async def scenario():
+        for queue_name in manager._queue_names([DEFAULT_QUEUE_GROUP]):
+            await manager._declare_queue(manager.channel, queue_name)
+
+    asyncio.run(scenario())
+
+    assert manager.channel.declared == {NATIVE_PRIORITY_QUEUE: {"x-max-priority": MAX_PRIORITY_LEVEL}}
+
+
+def test_native_priority_sets_the_message_priority(monkeypatch):
+    monkeypatch.setattr(settings, "queue_native_priority", True)
+    manager = manager_with_broker()
+
+    async def scenario():
+        for priority in QueuePriority:
+            await manager.enqueue({"type": "work", "memory_thread_id": "a"}, priority)
+
+    asyncio.run(scenario())
+
+    assert [(routing_key, message.priority) for routing_key, message in manager.channel.published] == [
+        (NATIVE_PRIORITY_QUEUE, PRIORITY_LEVELS[priority]) for priority in QueuePriority
+    ]
+
+
+def test_separate_priority_queues_publish_without_a_message_priority():
+    manager = manager_with_broker()
+
+    asyncio.run(manager.enqueue({"type": "work", "memory_thread_id": "a"}, QueuePriority.HIGH))
+
+    [(routing_key, message)] = manager.channel.published
+    assert routing_key == "high_task_queue"
+    assert not message.priority
+
+
+def test_delayed_messages_park_in_a_ttl_queue_that_dead_letters_to_their_target():
+    manager = manager_with_broker()
+
+    asyncio.run(manager.enqueue({"type": "work", "memory_thread_id": "a"}, QueuePriority.LOW, delay=2.5))
+
+    [(routing_key, _)] = manager.channel.published
+    assert routing_key == "low_task_queue.delay.2500"
+    assert manager.channel.declared[routing_key] == {
+        "x-message-ttl": 2500,
+        "x-dead-letter-exchange": "",
+        "x-dead-letter-routing-key": "low_task_queue",
+        "x-expires": 2500 + DELAY_QUEUE_EXPIRY_MARGIN_MS,
+    }
+
+
+def test_expired_delayed_messages_reach_the_target_queue_in_order():
+    manager = manager_with_broker()
+
+    async def scenario():
+        for n in range(3):
+            await manager.enqueue({"type": "work", "n": n, "memory_thread_id": "a"}, QueuePriority.HIGH, delay=1)
+
+    asyncio.run(scenario())
+    manager.channel.expire("high_task_queue.delay.1000")
+
+    delivered = [decode_payload(message.body, message.content_type)
+                 for message in manager.channel.queues["high_task_queue"]]
+    assert [item["data"]["n"] for item in delivered] == [0, 1, 2]
+    assert "high_task_queue.delay.1000" not in manager.channel.queues
+
+
+def test_delayed_message_wait_is_measured_from_its_due_time():
+    manager = manager_with_broker()
+    item = manager._build_queue_item({"type": "work"}, QueuePriority.MEDIUM)
+    enqueued_at = item["enqueued_at"]
+
+    asyncio.run(manager._publish(item, QueuePriority.MEDIUM, delay=30))
+
+    assert item["enqueued_at"] >= enqueued_at + 30
+
+
+def test_enqueue_many_reports_unconfirmed_publishes_and_keeps_the_rest(monkeypatch):
+    monkeypatch.setattr(settings, "queue_publish_batch_size", 2)
+    manager = manager_with_broker()
+    manager.channel.nacked_ids = {"m1", "m4"}
+    messages = [{"id": f"m{n}", "type": "work", "memory_thread_id": f"t{n}"} for n in range(5)]
+
+    result = asyncio.run(manager.enqueue_many(messages))
+
+    assert result["published"] == 3
+    assert [failure["id"] for failure in result["failed"]] == ["m1", "m4"]
+    assert all(failure["error"] == "publish not confirmed" for failure in result["failed"])
+    published = [envelope_id(message) for _, message in manager.channel.published]
+    assert published == ["m0", "m2", "m3"]
+
+
+def test_enqueue_many_with_no_messages_publishes_nothing():
+    manager = manager_with_broker()
+
+    assert asyncio.run(manager.enqueue_many([])) == {"published": 0, "failed": []}
+    assert manager.channel.published == []
+
+
+class FakeDelivery:
+    def __init__(self, body: bytes, content_type: str = "application/json"):
+        self.body = body
+        self.content_type = content_type
+        self.message_id = None
+        self.headers = {}
+        self.priority = None
+        self.settled = None
+
+    async def ack(self):
+        self.settled = "ack"
+
+    async def nack(self, requeue: bool = False):
+        self.settled = f"nack(requeue={requeue})"
+
+
+def test_undecodable_deliveries_are_dead_lettered_instead_of_dropped():
+    manager = manager_with_broker()
+    delivery = FakeDelivery(b"\xff not json")
+
+    asyncio.run(manager._on_delivery(0, delivery))
+
+    assert delivery.settled == "ack"
+    [(routing_key, message)] = manager.channel.published
+    assert routing_key == DEAD_LETTER_QUEUE
+    assert message.body == b"\xff not json"
+    dead_letter = manager._decode_dead_letter(message)
+    assert dead_letter["undecodable"] is True
+    assert dead_letter["id"].startswith("undecodable_")
+    assert dead_letter["last_error"]
+    assert manager._pending == 0
@@ -0,0 +1,53 @@
+import pytest
+
+from agent_worker import worker_shards
+from app.core.config import settings
+from app.core.orchestration.queue_manager import DEFAULT_QUEUE_GROUP, AsyncQueueManager, QueuePriority
+
+
+@pytest.fixture(autouse=True)
+def four_shards(monkeypatch):
+    monkeypatch.setattr(settings, "queue_shards", 4)
+    monkeypatch.setattr(settings, "queue_native_priority", False)
+
+
+def envelope(message_type: str, thread: str) -> dict:
+    return {"id": f"msg_{thread}", "data": {"type": message_type, "memory_thread_id": thread}}
+
+
+def test_worker_processes_partition_the_shards():
+    owned = [worker_shards(index, 3) for index in range(3)]
+
+    assert sorted(shard for shards in owned for shard in shards) == [0, 1, 2, 3]
+    assert all(owned)
+
+
+def test_a_conversation_always_routes_to_the_same_shard_at_every_priority():
+    manager = AsyncQueueManager()
+    shard = manager._shard_of("user-42")
+
+    for priority in QueuePriority:
+        assert manager._route(envelope("devrel_request", "user-42"), priority) == \
+            manager._queue_for(priority, DEFAULT_QUEUE_GROUP, shard)
+
+
+def test_each_task_queue_is_consumed_by_exactly_one_worker():
+    workers = [AsyncQueueManager(shards=worker_shards(index, 2)) for index in range(2)]
+    consumed = [set(worker._queue_names([DEFAULT_QUEUE_GROUP], worker.consumed_shards)) for worker in workers]
+
+    assert consumed[0].isdisjoint(consumed[1])
+    assert consumed[0] | consumed[1] == set(workers[0]._queue_names([DEFAULT_QUEUE_GROUP]))
+
+
+def test_egress_queues_are_not_sharded():
+    manager = AsyncQueueManager(shards=[1])
+
+    assert manager._route(envelope("discord_response", "user-42"), QueuePriority.HIGH) == \
+        "egress_high_task_queue"
+
+
+def test_exactly_one_worker_owns_each_thread():
+    workers = [AsyncQueueManager(shards=worker_shards(index, 3)) for index in range(3)]
+
+    for thread in (f"user-{n}" for n in range(50)):
+        assert sum(worker.owns_thread(thread) for worker in workers) == 1
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from app.agents.devrel.nodes.react_supervisor import (
+    _normalize_actions, _parse_supervisor_decision, add_tool_result, join_tool_results, react_supervisor_node,
+    supervisor_decision_router
+)
+from app.agents.state import AgentState
+
+
+def make_state(**fields) -> AgentState:
+    return AgentState(session_id="session", user_id="user", platform="discord", **fields)
+
+
+class FakeLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return type("Response", (), {"content": self.reply})()
+
+
+@pytest.mark.parametrize("requested, actions", [
+    (["web_search", "faq_handler", "web_search"], ["web_search", "faq_handler"]),
+    (["github_toolkit", "complete"], ["github_toolkit"]),
+    (["web_search", "onboarding"], ["onboarding"]),
+    (["unknown", "dance"], ["complete"]),
+    ([], ["complete"]),
+])
+def test_actions_are_deduplicated_and_exclusive_ones_run_alone(requested, actions):
+    assert _normalize_actions(requested) == actions
+
+
+def test_supervisor_reply_may_request_several_tools():
+    decision = _parse_supervisor_decision(
+        "THINK: Needs docs and code\nACT: web_search + github_toolkit, web_search\nREASON: Both help"
+    )
+
+    assert decision["actions"] == ["web_search", "github_toolkit"]
+    assert decision["action"] == "web_search"
+    assert decision["reasoning"] == "Both help"
+
+
+def test_supervisor_node_records_the_parsed_actions():
+    state = make_state(messages=[{"role": "user", "content": "How do I run the tests?"}])
+    llm = FakeLLM("THINK: x\nACT: FAQ_HANDLER+faq_handler+web_search\nREASON: y")
+
+    update = asyncio.run(react_supervisor_node(state, llm))
+
+    assert update["context"]["supervisor_decision"]["actions"] == ["faq_handler", "web_search"]
+    assert update["context"]["iteration_count"] == 1
+    assert update["current_task"] == "supervisor_decided_faq_handler+web_search"
+
+
+def test_router_fans_out_to_a_list_of_tools():
+    state = make_state(context={"supervisor_decision": {"actions": ["web_search", "github_toolkit"]}})
+
+    assert supervisor_decision_router(state) == ["web_search", "github_toolkit"]
+
+
+def test_router_returns_a_single_node_for_one_action():
+    state = make_state(context={"supervisor_decision": {"action": "faq_handler"}})
+
+    assert supervisor_decision_router(state) == "faq_handler"
+
+
+def test_router_stops_after_too_many_iterations():
+    state = make_state(context={"supervisor_decision": {"actions": ["web_search"]}, "iteration_count": 11})
+
+    assert supervisor_decision_router(state) == "complete"
+
+
+def test_join_merges_every_tool_output_into_the_context():
+    state = make_state(
+        context={"iteration_count": 2, "tool_results": [{"tool": "faq_handler", "result": {}, "iteration": 1}],
+                 "stale": "x"},
+        tools_used=["faq_handler"],
+    )
+    outputs = [
+        *add_tool_result(state, "web_search", {"results": ["hit"]}, {"search_query": "tests"})["tool_outputs"],
+        *add_tool_result(state, "github_toolkit", {"status": "success"}, {"stale": None})["tool_outputs"],
+    ]
+    state = state.model_copy(update={"tool_outputs": outputs})
+
+    update = asyncio.run(join_tool_results(state))
+
+    assert update["context"]["tool_results"] == [
+        {"tool": "faq_handler", "result": {}, "iteration": 1},
+        {"tool": "web_search", "result": {"results": ["hit"]}, "iteration": 2},
+        {"tool": "github_toolkit", "result": {"status": "success"}, "iteration": 2},
+    ]
+    assert update["context"]["search_query"] == "tests"
+    assert "stale" not in update["context"]
+    assert update["tools_used"] == ["faq_handler", "web_search", "github_toolkit"]
+    assert update["tool_outputs"] is None
+    assert update["current_task"] == "completed_web_search+github_toolkit"
+
+
+def test_parallel_tools_are_joined_once_in_a_graph():
+    joins = []
+
+    def supervisor(state: AgentState):
+        if state.context.get("tool_results"):
+            return {"context": {**state.context, "supervisor_decision": {"actions": ["complete"]}}}
+        return {"context": {**state.context, "iteration_count": 1,
+                            "supervisor_decision": {"actions": ["web_search", "faq_handler"]}}}
+
+    def tool(name):
+        async def node(state: AgentState):
+            return add_tool_result(state, name, {"from": name})
+        return node
+
+    async def join(state: AgentState):
+        joins.append(len(state.tool_outputs))
+        return await join_tool_results(state)
+
+    workflow = StateGraph(AgentState)
+    workflow.add_node("react_supervisor", supervisor)
+    workflow.add_node("web_search", tool("web_search"))
+    workflow.add_node("faq_handler", tool("faq_handler"))
+    workflow.add_node("join_tool_results", join)
+    workflow.set_entry_point("react_supervisor")
+    workflow.add_conditional_edges("react_supervisor", supervisor_decision_router, {
+        "web_search": "web_search", "faq_handler": "faq_handler", "complete": END
+    })
+    for name in ["web_search", "faq_handler"]:
+        workflow.add_edge(name, "join_tool_results")
+    workflow.add_edge("join_tool_results", "react_supervisor")
+
+    final = asyncio.run(workflow.compile().ainvoke(make_state()))
+
+    assert joins == [2]
+    assert sorted(result["tool"] for result in final["context"]["tool_results"]) == ["faq_handler", "web_search"]
+    assert final["tool_outputs"] == []
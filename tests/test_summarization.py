@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
+
+from app.agents.devrel.agent import MAX_SUMMARY_PASSES, DevRelAgent
+from app.agents.devrel.nodes.summarization import (
+    MAX_KEY_TOPICS, _parse_summary_response, check_summarization_needed, summarize_conversation_node
+)
+from app.agents.state import AgentState
+from app.core.config import settings
+
+START = datetime(2026, 1, 1, 12, 0)
+REPLY = '```json\n{"summary": "Asked about setup", "key_topics": ["setup", "docker"]}\n```'
+
+
+def message(n: int) -> dict:
+    return {"role": "user", "content": f"message {n}", "timestamp": (START + timedelta(minutes=n)).isoformat()}
+
+
+class FakeLLM:
+    def __init__(self, reply: str = REPLY):
+        self.reply = reply
+        self.prompts = []
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        self.prompts.append(messages[0].content)
+        return type("Response", (), {"content": self.reply})()
+
+
+@pytest.fixture(autouse=True)
+def window_of_two(monkeypatch):
+    monkeypatch.setattr(settings, "agent_message_window", 2)
+
+
+def test_fenced_json_is_parsed():
+    assert _parse_summary_response(REPLY) == ("Asked about setup", ["setup", "docker"])
+
+
+def test_topics_may_be_a_comma_separated_string_and_are_capped():
+    topics = ", ".join(f"topic {n}" for n in range(MAX_KEY_TOPICS + 2))
+
+    summary, parsed = _parse_summary_response(f'Here you go: {{"summary": " S ", "key_topics": "{topics} , "}}')
+
+    assert summary == "S"
+    assert parsed == [f"topic {n}" for n in range(MAX_KEY_TOPICS)]
+
+
+@pytest.mark.parametrize("content", [
+    "The user asked about setup.",
+    '{"summary": "cut off',
+    '["not", "an", "object"]',
+])
+def test_malformed_json_falls_back_to_plain_text(content):
+    assert _parse_summary_response(content) == (content, [])
+
+
+def test_summary_advances_the_watermark_and_resets_the_count():
+    state = AgentState(session_id="s", user_id="u", platform="discord", interaction_count=15,
+                       messages=[message(n) for n in range(3)])
+
+    updates = asyncio.run(summarize_conversation_node(state, FakeLLM()))
+
+    assert updates["conversation_summary"] == "Asked about setup"
+    assert updates["key_topics"] == ["setup", "docker"]
+    assert updates["summarized_until"] == START + timedelta(minutes=2)
+    assert updates["interaction_count"] == -15
+    assert updates["summarization_needed"] is False
+
+
+def test_empty_summary_is_reported_without_touching_the_state():
+    state = AgentState(session_id="s", user_id="u", platform="discord", interaction_count=15,
+                       messages=[message(0)], conversation_summary="Old summary")
+
+    updates = asyncio.run(summarize_conversation_node(state, FakeLLM('{"summary": ""}')))
+
+    assert updates == {"errors": ["Summarization error: Empty summary in LLM response"],
+                       "summarization_needed": False}
+
+
+def make_agent(llm: FakeLLM) -> DevRelAgent:
+    workflow = StateGraph(AgentState)
+    workflow.add_node("check_summarization", check_summarization_needed)
+    workflow.set_entry_point("check_summarization")
+    workflow.add_edge("check_summarization", END)
+
+    agent = DevRelAgent.__new__(DevRelAgent)
+    agent.llm = llm
+    agent.graph = workflow.compile(checkpointer=MemorySaver())
+    return agent
+
+
+def run_turn(agent: DevRelAgent, interaction_count: int, messages: list):
+    config = {"configurable": {"thread_id": "thread"}}
+    state = AgentState(session_id="s", user_id="u", platform="discord",
+                       interaction_count=interaction_count, messages=messages)
+    return asyncio.run(agent.graph.ainvoke(state, config))
+
+
+def test_summarize_thread_writes_the_summary_to_the_checkpoint():
+    llm = FakeLLM()
+    agent = make_agent(llm)
+    run_turn(agent, 14, [message(n) for n in range(4)])
+
+    state = asyncio.run(agent.summarize_thread("thread"))
+
+    assert len(llm.prompts) == 1
+    assert state.conversation_summary == "Asked about setup"
+    assert state.key_topics == ["setup", "docker"]
+    assert state.summarized_until == START + timedelta(minutes=3)
+    assert state.interaction_count == 0
+    assert not state.summarization_needed
+    assert [m["content"] for m in state.messages] == ["message 2", "message 3"]
+
+
+def test_a_large_backlog_is_summarized_over_several_passes(monkeypatch):
+    # Every pass fits just one message
+    monkeypatch.setattr(settings, "prompt_section_budgets", {"summary_conversation": 1})
+    llm = FakeLLM()
+    agent = make_agent(llm)
+    run_turn(agent, 14, [message(n) for n in range(MAX_SUMMARY_PASSES + 1)])
+
+    state = asyncio.run(agent.summarize_thread("thread"))
+
+    assert len(llm.prompts) == MAX_SUMMARY_PASSES
+    assert state.summarized_until == START + timedelta(minutes=MAX_SUMMARY_PASSES - 1)
+    assert state.summarization_needed
+    assert state.interaction_count == 0
+    assert [m["content"] for m in state.messages] == [
+        f"message {MAX_SUMMARY_PASSES - 1}", f"message {MAX_SUMMARY_PASSES}"
+    ]
+
+
+def test_threads_without_state_are_skipped():
+    assert asyncio.run(make_agent(FakeLLM()).summarize_thread("missing")) is None
@@ -0,0 +1,137 @@
+import pytest
+
+from app.agents.devrel.nodes.supervisor_rules import (
+    RuleDecision, SupervisorRules, default_rules, faq_exact_match_rule, github_issue_url_rule,
+    onboarding_stage_rule, tool_results_answer_rule
+)
+from app.agents.devrel.onboarding.workflow import OnboardingStage
+from app.agents.state import AgentState
+from app.core.config import settings
+
+
+class FakeFAQTool:
+    faq_responses = {"what is devr.ai": "An AI DevRel assistant."}
+
+
+@pytest.fixture(autouse=True)
+def rules_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "supervisor_rules_enabled", True)
+    monkeypatch.setattr(settings, "supervisor_rule_min_confidence", 0.85)
+
+
+def make_state(tool_results=None, onboarding_stage=None) -> AgentState:
+    return AgentState(
+        session_id="session",
+        user_id="user",
+        platform="discord",
+        context={"tool_results": tool_results or []},
+        onboarding_state={"stage": onboarding_stage} if onboarding_stage else {},
+    )
+
+
+def test_latest_tool_round_with_an_answer_completes():
+    state = make_state([
+        {"tool": "web_search", "iteration": 1, "result": {"results": []}},
+        {"tool": "faq_handler", "iteration": 2, "result": {"response": "Yes"}},
+        {"tool": "web_search", "iteration": 2, "result": {"results": ["hit"]}},
+    ])
+
+    decision = tool_results_answer_rule(state, "anything")
+
+    assert decision.action == "complete"
+    assert decision.confidence == 0.95
+
+
+def test_older_rounds_do_not_count_as_an_answer():
+    state = make_state([
+        {"tool": "faq_handler", "iteration": 1, "result": {"response": "Yes"}},
+        {"tool": "github_toolkit", "iteration": 2, "result": {"status": "error"}},
+    ])
+
+    assert tool_results_answer_rule(state, "anything") is None
+
+
+@pytest.mark.parametrize("result", [
+    {"status": "success", "issues": [{"number": 1}]},
+    {"status": "success", "repository": {"name": "Devr.AI"}},
+    {"status": "success", "response": "Fork the repository first."},
+])
+def test_github_results_with_data_complete(result):
+    state = make_state([{"tool": "github_toolkit", "iteration": 1, "result": result}])
+
+    decision = SupervisorRules([tool_results_answer_rule]).decide(state, "anything")
+
+    assert decision.action == "complete"
+
+
+@pytest.mark.parametrize("result", [
+    {"status": "success", "recommendations": [], "message": "No suitable contributors found"},
+    {"status": "success", "repository": "AOSSIE-Org/Devr.AI"},
+    {"status": "not_indexed", "repository": "AOSSIE-Org/Devr.AI", "message": "Index it first"},
+    {"status": "no_results", "results": []},
+])
+def test_github_results_without_data_defer_to_the_llm(result):
+    state = make_state([{"tool": "github_toolkit", "iteration": 1, "result": result}])
+
+    assert tool_results_answer_rule(state, "anything").confidence < settings.supervisor_rule_min_confidence
+    assert SupervisorRules([tool_results_answer_rule]).decide(state, "anything") is None
+
+
+def test_onboarding_awaiting_choice_continues_onboarding():
+    state = make_state(onboarding_stage=OnboardingStage.AWAITING_CHOICE.value)
+
+    assert onboarding_stage_rule(state, "2").action == "onboarding"
+
+
+@pytest.mark.parametrize("message, action", [
+    ("https://github.com/AOSSIE-Org/Devr.AI/issues/42", "github_toolkit"),
+    ("<https://github.com/AOSSIE-Org/Devr.AI/issues/42>", "github_toolkit"),
+    ("can you look at https://github.com/AOSSIE-Org/Devr.AI/issues/42 later?", None),
+])
+def test_only_bare_issue_links_go_to_the_github_toolkit(message, action):
+    decision = github_issue_url_rule(make_state(), message)
+
+    assert (decision.action if decision else None) == action
+
+
+def test_exact_faq_question_is_answered_from_the_faq():
+    rule = faq_exact_match_rule(FakeFAQTool())
+
+    assert rule(make_state(), "  What is   Devr.AI?? ").action == "faq_handler"
+    assert rule(make_state(), "What is Devr.AI used for?") is None
+
+
+def test_low_confidence_decisions_fall_through_to_the_llm():
+    state = make_state(onboarding_stage=OnboardingStage.ENCOURAGE_VERIFICATION.value)
+
+    assert SupervisorRules(default_rules(FakeFAQTool())).decide(state, "hello") is None
+
+
+def test_first_confident_rule_wins_and_is_named():
+    def never(state, message):
+        return None
+
+    def confident(state, message):
+        return RuleDecision("web_search", 0.9, "sure")
+
+    def later(state, message):
+        return RuleDecision("complete", 1.0, "also sure")
+
+    decision = SupervisorRules([never, confident, later]).decide(make_state(), "hi")
+
+    assert (decision.action, decision.rule) == ("web_search", "confident")
+
+
+def test_failing_rules_are_skipped():
+    def broken(state, message):
+        raise RuntimeError("boom")
+
+    rules = SupervisorRules([broken, github_issue_url_rule])
+
+    assert rules.decide(make_state(), "https://github.com/o/r/issues/1").action == "github_toolkit"
+
+
+def test_disabled_rules_always_defer_to_the_llm(monkeypatch):
+    monkeypatch.setattr(settings, "supervisor_rules_enabled", False)
+
+    assert SupervisorRules([github_issue_url_rule]).decide(make_state(), "https://github.com/o/r/issues/1") is None
@@ -0,0 +1,161 @@
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from app.core import timing
+from app.core.llm import SharedLLMClient
+from app.core.llm import registry as llm_registry
+from app.core.timing import (
+    DB_CALL_SECONDS, NODE_LLM_SECONDS, NODE_SECONDS, NODE_TOKENS, discard_session_timings, record_llm,
+    session_timings, timed_db, timed_node
+)
+
+
+class Session:
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions(monkeypatch):
+    monkeypatch.setattr(timing, "_sessions", OrderedDict())
+
+
+def observations(histogram, **labels) -> int:
+    return next((value for name, sample_labels, value in histogram.samples()
+                 if name.endswith("_count") and sample_labels == labels), 0)
+
+
+@timed_db
+async def fetch_user(delay: float = 0):
+    await asyncio.sleep(delay)
+    return {"id": "u"}
+
+
+def test_each_node_execution_is_timed_per_session():
+    async def supervisor(state):
+        record_llm(0.25, {"input_tokens": 100, "output_tokens": 20})
+        record_llm(0.5, {"input_tokens": 50, "output_tokens": None})
+        await fetch_user(0.01)
+        return {}
+
+    async def respond(state):
+        return {}
+
+    runs = observations(NODE_SECONDS, node="timed_supervisor")
+    token_runs = observations(NODE_TOKENS, node="timed_supervisor", type="input")
+
+    async def scenario():
+        await timed_node("timed_supervisor", supervisor)(Session("a"))
+        await timed_node("timed_respond", respond)(Session("a"))
+
+    asyncio.run(scenario())
+
+    first, second = session_timings("a")
+    assert first["node"] == "timed_supervisor"
+    assert first["llm_calls"] == 2
+    assert first["llm_seconds"] == 0.75
+    assert (first["input_tokens"], first["output_tokens"]) == (150, 20)
+    assert 0.01 <= first["db_seconds"] <= first["wall_seconds"]
+    assert second["node"] == "timed_respond"
+    assert second["llm_calls"] == 0 and second["db_seconds"] == 0
+    assert observations(NODE_SECONDS, node="timed_supervisor") == runs + 1
+    assert observations(NODE_TOKENS, node="timed_supervisor", type="input") == token_runs + 1
+    # Nodes without LLM calls don't skew the token histograms with zeros
+    assert observations(NODE_TOKENS, node="timed_respond", type="input") == 0
+
+
+def test_concurrent_nodes_only_see_their_own_calls():
+    async def node(state):
+        for _ in range(3):
+            record_llm(0.1 if state.session_id == "a" else 1.0)
+            await fetch_user(0.001)
+        return {}
+
+    async def scenario():
+        await asyncio.gather(timed_node("timed_tool", node)(Session("a")), timed_node("timed_tool", node)(Session("b")))
+
+    asyncio.run(scenario())
+
+    [a], [b] = session_timings("a"), session_timings("b")
+    assert (a["llm_calls"], a["llm_seconds"]) == (3, 0.3)
+    assert (b["llm_calls"], b["llm_seconds"]) == (3, 3.0)
+
+
+def test_calls_outside_a_node_are_not_attributed():
+    async def node(state):
+        return {}
+
+    async def scenario():
+        await timed_node("timed_idle", node)(Session("a"))
+        record_llm(1.0, {"input_tokens": 10})
+        await fetch_user()
+
+    db_calls = observations(DB_CALL_SECONDS, operation="fetch_user")
+    asyncio.run(scenario())
+
+    [idle] = session_timings("a")
+    assert idle["llm_calls"] == 0 and idle["db_seconds"] == 0
+    # The DB call itself is still measured
+    assert observations(DB_CALL_SECONDS, operation="fetch_user") == db_calls + 1
+
+
+def test_failing_nodes_are_still_timed():
+    async def node(state):
+        record_llm(0.2)
+        raise RuntimeError("boom")
+
+    before = observations(NODE_LLM_SECONDS, node="timed_failing")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(timed_node("timed_failing", node)(Session("a")))
+
+    [failed] = session_timings("a")
+    assert failed["llm_calls"] == 1
+    assert observations(NODE_LLM_SECONDS, node="timed_failing") == before + 1
+    assert timing._current_node.get() is None
+
+
+def test_sessions_are_bounded_and_discarded(monkeypatch):
+    monkeypatch.setattr(timing, "MAX_TRACKED_SESSIONS", 2)
+
+    async def node(state):
+        return {}
+
+    async def scenario():
+        for session_id in ("a", "b", "c"):
+            await timed_node("timed_noop", node)(Session(session_id))
+
+    asyncio.run(scenario())
+    discard_session_timings("c")
+
+    assert session_timings("a") == []
+    assert len(session_timings("b")) == 1
+    assert session_timings("c") == []
+
+
+class UsageModel:
+    async def ainvoke(self, messages, config=None, **kwargs):
+        await asyncio.sleep(0.01)
+        return type("Response", (), {"content": "ok", "usage_metadata": {"input_tokens": 7, "output_tokens": 3}})()
+
+
+def test_shared_llm_client_reports_to_the_running_node(monkeypatch):
+    monkeypatch.setattr(llm_registry, "_global_slots", None)
+    monkeypatch.setattr(llm_registry, "_model_slots", {})
+    client = SharedLLMClient.__new__(SharedLLMClient)
+    client.model = "timed-model"
+    client.temperature = 0.0
+    client.client = UsageModel()
+
+    async def node(state):
+        await client.ainvoke("hi")
+        return {}
+
+    asyncio.run(timed_node("timed_llm", node)(Session("a")))
+
+    [timed] = session_timings("a")
+    assert timed["llm_calls"] == 1
+    assert (timed["input_tokens"], timed["output_tokens"]) == (7, 3)
+    assert timed["llm_seconds"] >= 0.01